@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+빌드 산출물 → 내용 해시 이름 + 미리 압축한 변형 + 자산 매니페스트 (PWA 오프라인 캐시용)
+- 이름: <이름>.<sha256 앞 HASH_LEN 글자><확장자>  (예: vocab_shared.3f2a9c01d4.css)
+  내용이 같으면 이름도 같으므로 서비스 워커/CDN 은 매니페스트에서 바뀐 항목만 다시 받으면 됨
+  (해시 이름 파일은 immutable 캐시, asset-manifest.json 만 no-cache 로 서빙)
+- 압축 변형: 해시 이름 + .gz (항상), .br (brotli 설치 시), .zst (zstandard 설치 시)
+  gzip 은 mtime=0 으로 기록 → 같은 입력이면 같은 바이트. MIN_SIZE 미만이거나 원본보다 커지는 변형은 만들지 않음
+  정적 호스트는 Accept-Encoding 에 맞는 변형을 그대로 내보내면 되므로 요청마다 압축하지 않음
+- 병렬: 산출물 단위로 프로세스 풀에 분배 (큰 파일부터 제출). 이미 있는 해시 이름/변형 파일은 다시 압축하지 않음
+- 매니페스트(<출력>/asset-manifest.json):
+  {"format": "vocab-assets/1", "encodings": {"gzip": ".gz", ...},
+   "assets": {논리 이름: {"file": 해시 이름, "bytes", "sha256",
+                          "encodings": {"gzip": {"file", "bytes"}, "br": {...}, "zstd": {...}}}, ...}}
+  논리 이름 = 입력 디렉터리 기준 상대 경로 (예: "index.json", "vocab_shared.css", "사랑영단어 수능 2000.json")
+- --prune: 매니페스트에 없는 예전 해시 파일(HASHED 이름 형식인 것만) 삭제
+  출력 디렉터리는 입력 디렉터리 안쪽이어야 함 (입력 자체나 그 상위면 오류 — 산출물이 매니페스트에서 빠지고 지워짐)
+- 사용: python asset_pack.py dist/ [-o dist/assets] [-j 4] [--prune]
+        python main.py books/ -o dist/ --assets   (빌드 직후 dist/assets 로 패킹)
+- brotli / zstandard 는 선택 (pip install .[compress]). 없으면 gzip 만
+"""
+import argparse, gzip, hashlib, json, os, re, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ASSET_FORMAT = "vocab-assets/1"
+MANIFEST = "asset-manifest.json"
+HASH_LEN = 10
+MIN_SIZE = 1024   # 이보다 작은 파일은 압축 변형을 만들지 않음 (헤더 오버헤드 > 이득)
+# hashed_name 결과 (+ 압축 변형 확장자) — --prune 은 이 형식의 파일만 지움
+HASHED = re.compile(rf"\.[0-9a-f]{{{HASH_LEN}}}(?:\.[^./]+)?(?:\.gz|\.br|\.zst)?$")
+
+def _gzip(data:bytes)->bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def _brotli(data:bytes)->bytes:
+    return brotli.compress(data, quality=11)
+
+def _zstd(data:bytes)->bytes:
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+# 인코딩 이름(Accept-Encoding 토큰과 같은 의미) → (확장자, 압축 함수)
+ENCODERS = {"gzip": (".gz", _gzip)}
+if brotli is not None:
+    ENCODERS["br"] = (".br", _brotli)
+if zstandard is not None:
+    ENCODERS["zstd"] = (".zst", _zstd)
+
+def hashed_name(name:str, digest:str)->str:
+    stem, dot, ext = name.rpartition(".")
+    return f"{stem}.{digest[:HASH_LEN]}.{ext}" if dot and stem else f"{name}.{digest[:HASH_LEN]}"
+
+def _write(path:Path, data:bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def pack_file(src, logical:str, out_dir, encodings=tuple(ENCODERS), min_size=MIN_SIZE):
+    """프로세스 풀용: 산출물 하나 → (논리 이름, 매니페스트 항목, 새로 압축한 변형 수)"""
+    data = Path(src).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    rel = Path(logical)
+    target = Path(out_dir) / rel.parent / hashed_name(rel.name, digest)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.is_file():
+        _write(target, data)
+    entry = {"file": target.relative_to(out_dir).as_posix(), "bytes": len(data), "sha256": digest, "encodings": {}}
+    made = 0
+    if len(data) >= min_size:
+        for enc in encodings:
+            ext, compress = ENCODERS[enc]
+            variant = target.with_name(target.name + ext)
+            if variant.is_file():
+                size = variant.stat().st_size
+            else:
+                packed = compress(data)
+                if len(packed) >= len(data):
+                    continue
+                _write(variant, packed)
+                size, made = len(packed), made + 1
+            entry["encodings"][enc] = {"file": variant.relative_to(out_dir).as_posix(), "bytes": size}
+    return logical, entry, made
+
+def collect(inputs, out_dir):
+    """파일/디렉터리 → {논리 이름: 경로}. 출력 디렉터리·임시 파일·압축 변형은 제외"""
+    out_dir = Path(out_dir).resolve()
+    skip = {".gz", ".br", ".zst", ".tmp"}
+    found = {}
+    for p in map(Path, inputs):
+        if p.is_dir():
+            files = ((f, f.relative_to(p).as_posix()) for f in sorted(p.rglob("*")) if f.is_file())
+        else:
+            files = [(p, p.name)]
+        for f, logical in files:
+            if f.suffix in skip or out_dir in f.resolve().parents:
+                continue
+            if logical in found and found[logical] != f:
+                raise ValueError(f"논리 이름 중복 '{logical}': {found[logical]} / {f}")
+            found[logical] = f
+    return found
+
+def pack(inputs, out_dir, workers=1, encodings=tuple(ENCODERS), min_size=MIN_SIZE, prune=False):
+    """산출물들을 out_dir 로 패킹하고 매니페스트 기록 → (매니페스트, {"files", "compressed", "pruned"})"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = collect(inputs, out_dir)
+    job = partial(pack_file, out_dir=out_dir, encodings=tuple(encodings), min_size=min_size)
+    order = sorted(files, key=lambda k: files[k].stat().st_size, reverse=True)   # 큰 파일부터 → 풀 꼬리 짧게
+    if workers > 1 and len(order) > 1:
+        with ProcessPoolExecutor(min(workers, len(order))) as pool:
+            results = list(pool.map(job, (files[k] for k in order), order))
+    else:
+        results = [job(files[k], k) for k in order]
+    assets = {logical: entry for logical, entry, _ in sorted(results)}
+    manifest = {"format": ASSET_FORMAT, "encodings": {e: ENCODERS[e][0] for e in encodings}, "assets": assets}
+    _write(out_dir / MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    removed = 0
+    if prune:
+        keep = {MANIFEST} | {e["file"] for e in assets.values()}
+        keep |= {v["file"] for e in assets.values() for v in e["encodings"].values()}
+        for f in out_dir.rglob("*"):
+            rel = f.relative_to(out_dir).as_posix()
+            if f.is_file() and rel not in keep and HASHED.search(f.name):
+                f.unlink()
+                removed += 1
+    stats = {"files": len(assets), "compressed": sum(made for _, _, made in results), "pruned": removed}
+    return manifest, stats
+
+def report(manifest)->str:
+    """인코딩별 합계 바이트 요약"""
+    assets = manifest["assets"].values()
+    total = sum(e["bytes"] for e in assets)
+    parts = [f"원본 {total:,}"]
+    for enc in manifest["encodings"]:
+        size = sum(e["encodings"][enc]["bytes"] if enc in e["encodings"] else e["bytes"] for e in assets)
+        parts.append(f"{enc} {size:,} ({size / total:.1%})" if total else f"{enc} 0")
+    return " / ".join(parts) + " bytes"
+
+def overlaps(inputs, out_dir)->list:
+    """out_dir 가 입력 경로 자체이거나 그 상위인 입력들 (패킹 결과가 산출물을 가리게 되는 경우)"""
+    out = Path(out_dir).resolve()
+    return [p for p in map(Path, inputs) if out == p.resolve() or out in p.resolve().parents]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="빌드 산출물 → 해시 이름 + 미리 압축한 변형 + asset-manifest.json")
+    ap.add_argument("inputs", nargs="+", type=Path, help="빌드 디렉터리 또는 파일 (예: dist/ vocab_shared.css)")
+    ap.add_argument("-o", "--out", type=Path, help="출력 디렉터리 (기본: 첫 입력 디렉터리/assets)")
+    ap.add_argument("-j", "--workers", default=os.cpu_count() or 1, type=int, help="압축 프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--encodings", default=",".join(ENCODERS),
+                    help="만들 변형 (기본: 사용 가능한 전부 = %(default)s)")
+    ap.add_argument("--min-size", default=MIN_SIZE, type=int, help="압축 변형을 만들 최소 바이트 (기본: %(default)s)")
+    ap.add_argument("--prune", action="store_true", help="매니페스트에 없는 예전 해시 파일 삭제")
+    args = ap.parse_args(argv)
+
+    encodings = [e for e in args.encodings.split(",") if e]
+    unknown = [e for e in encodings if e not in ENCODERS]
+    if unknown:
+        ap.error(f"쓸 수 없는 인코딩: {', '.join(unknown)} (사용 가능: {', '.join(ENCODERS)})")
+    first = args.inputs[0]
+    out = args.out or (first if first.is_dir() else first.parent) / "assets"
+    bad = overlaps(args.inputs, out)
+    if bad:
+        ap.error(f"출력 디렉터리 {out} 가 입력 {', '.join(map(str, bad))} 과 같거나 그 상위임 (예: -o {bad[0]}/assets)")
+    t0 = time.perf_counter()
+    try:
+        manifest, stats = pack(args.inputs, out, args.workers, encodings, args.min_size, args.prune)
+    except ValueError as e:
+        ap.error(str(e))
+    print(report(manifest))
+    print(f"{stats['files']}개 산출물 / 새로 압축 {stats['compressed']} / 삭제 {stats['pruned']}"
+          f" → {(out / MANIFEST).as_posix()} ({time.perf_counter() - t0:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
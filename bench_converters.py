@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+세 변환기(parse_vocab.py / create_vocab_json_styled.py / pdf2json2.py) 벤치마크
+- 수능 2000 텍스트 형식의 합성 코퍼스를 1× / 10× / 100× (2000 블록 단위) 로 생성
+  * id 는 책 단위로 0001~2000 반복 (여러 권을 합친 코퍼스와 같은 모양)
+  * 발음 없는 숙어, 토큰 없는 뜻, 두 줄로 접힌 EN/KO 라인도 섞어 넣음
+  * 시드 고정 → 같은 배율이면 매번 같은 코퍼스
+- 변환기 × 배율마다 새 프로세스에서 실행해 단계별 시간과 최대 RSS 측정
+  * pdf2json2            : split / classify(line_classifier) / merge(parse_labeled) / html / serialize
+  * create_vocab_json_styled: parse(split+헤더) / html(create_html_content) / serialize(json.dump)
+  * parse_vocab          : parse+html(parse_vocabulary_file) / serialize(save_to_json)
+  변환기가 단계를 따로 노출하지 않는 경우 합쳐진 이름으로 기록
+- 결과는 JSON 으로 저장 (git 커밋 포함). --compare 로 이전 결과와 단계별 비율 비교
+- 사용: python bench_converters.py [--scales 1 10 100] [-o bench_results.json] [--compare 이전.json]
+"""
+import argparse, json, platform, random, resource, subprocess, tempfile, time, types
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+BLOCKS_PER_BOOK = 2000
+OUT_RESULTS = Path("./bench_results.json")
+CONVERTERS = ("pdf2json2", "create_vocab_json_styled", "parse_vocab")
+
+POS_TOKENS = ("ⓥ", "ⓝ", "ⓐ", "ⓟ", "ad", "pn", "~")
+EXAMS = ("모고", "수능")
+
+def _en_word(rng):
+    return "".join(rng.choice("bcdfghjklmnprstvw") + rng.choice("aeiou") for _ in range(rng.randint(1, 4)))
+
+def _ko_word(rng):
+    return "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(1, 4)))
+
+def _wrap(line, rng, ratio=0.15):
+    """일부 라인을 PDF 추출처럼 두 줄로 접음"""
+    words = line.split(" ")
+    if len(words) > 4 and rng.random() < ratio:
+        cut = rng.randint(2, len(words) - 2)
+        return [" ".join(words[:cut]), " ".join(words[cut:])]
+    return [line]
+
+def synth_block(rng, word_id):
+    idiom = rng.random() < 0.08
+    headword = " ".join(_en_word(rng) for _ in range(2)) if idiom else _en_word(rng)
+    lines = [f"{word_id:04d}"]
+    if not idiom:
+        lines.append(f"[{headword}ː]")
+    lines.append(headword)
+    for _ in range(rng.randint(1, 3)):
+        mean = ", ".join(_ko_word(rng) + "하다" for _ in range(rng.randint(1, 3)))
+        lines.append(mean if idiom else f"{rng.choice(POS_TOKENS)} {mean}")
+    for _ in range(rng.randint(1, 3)):
+        en = " ".join([headword.capitalize()] + [_en_word(rng) for _ in range(rng.randint(5, 16))]) + "."
+        lines += _wrap(f"{en} {rng.randint(0, 15):02d}{rng.choice(EXAMS)}", rng)
+        lines += _wrap(" ".join(_ko_word(rng) for _ in range(rng.randint(4, 12))) + ".", rng)
+    return "\n".join(lines)
+
+def write_corpus(path, scale, seed=2000):
+    """scale × 2000 블록 코퍼스를 path 에 기록. 같은 시드면 작은 배율이 큰 배율의 앞부분과 같음"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(scale * BLOCKS_PER_BOOK):
+            f.write(synth_block(rng, i % BLOCKS_PER_BOOK + 1))
+            f.write("\n---\n")
+    return Path(path)
+
+def _rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+class Stages:
+    def __init__(self):
+        self.times = {}
+
+    def run(self, name, fn, *args):
+        t = time.perf_counter()
+        out = fn(*args)
+        self.add(name, time.perf_counter() - t)
+        return out
+
+    def add(self, name, sec):
+        self.times[name] = self.times.get(name, 0.0) + sec
+
+    def timed(self, name, fn):
+        def wrapper(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - t)
+        return wrapper
+
+def bench_pdf2json2(src, out, st):
+    import pdf2json2
+    blocks = st.run("split", lambda: list(pdf2json2.iter_blocks(src)))
+    labeled = st.run("classify", lambda: [pdf2json2.classify_block(b) for b in blocks])
+    fields = st.run("merge", lambda: [r for ls in labeled if (r := pdf2json2.parse_labeled(ls))])
+    records = st.run("html", lambda: [pdf2json2.to_html_record(r) for r in fields])
+    st.run("serialize", pdf2json2.write_records, records, out)
+    return len(blocks), len(records)
+
+def bench_create_vocab_json_styled(src, out, st):
+    import create_vocab_json_styled as m
+    m.LOG_FILE = None
+    m.create_html_content = st.timed("html", m.create_html_content)
+    m.json = types.SimpleNamespace(dump=st.timed("serialize", json.dump))
+    total = time.perf_counter()
+    m.parse_vocab_file(str(src), str(out))
+    st.add("parse", time.perf_counter() - total - st.times.get("html", 0) - st.times.get("serialize", 0))
+    records = json.loads(Path(out).read_text(encoding="utf-8"))
+    return None, len(records)
+
+def bench_parse_vocab(src, out, st):
+    import parse_vocab
+    records = st.run("parse+html", parse_vocab.parse_vocabulary_file, str(src))
+    st.run("serialize", parse_vocab.save_to_json, records, str(out))
+    return None, len(records)
+
+def run_one(converter, src, scale):
+    """자식 프로세스에서 실행: 변환기 한 개 × 코퍼스 한 개"""
+    rss0 = _rss_kb()
+    st = Stages()
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "out.json"
+        t = time.perf_counter()
+        blocks, records = globals()[f"bench_{converter}"](Path(src), out, st)
+        total = time.perf_counter() - t
+        out_bytes = out.stat().st_size
+    return {
+        "converter": converter,
+        "scale": scale,
+        "blocks": blocks,
+        "records": records,
+        "stages": {k: round(v, 6) for k, v in st.times.items()},
+        "total_sec": round(total, 6),
+        "records_per_sec": round(records / total, 1) if total else None,
+        "output_bytes": out_bytes,
+        "peak_rss_kb": _rss_kb(),
+        "base_rss_kb": rss0,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(base, cur):
+    """이전 결과 대비 단계별 시간 비율 출력 (>1 이면 느려짐)"""
+    prev = {(r["converter"], r["scale"]): r for r in base["results"]}
+    for r in cur["results"]:
+        b = prev.get((r["converter"], r["scale"]))
+        if not b:
+            continue
+        parts = [f"{k} ×{v / b['stages'][k]:.2f}" for k, v in r["stages"].items() if b["stages"].get(k)]
+        print(f"  {r['converter']:<26} {r['scale']:>4}×  total ×{r['total_sec'] / b['total_sec']:.2f}  "
+              f"rss ×{r['peak_rss_kb'] / b['peak_rss_kb']:.2f}  " + "  ".join(parts))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="변환기 벤치마크 (합성 코퍼스 1×/10×/100×)")
+    ap.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100], help="2000 블록 단위 배율")
+    ap.add_argument("--converters", nargs="+", choices=CONVERTERS, default=list(CONVERTERS))
+    ap.add_argument("--corpus-dir", type=Path, help="코퍼스 저장/재사용 디렉터리 (기본: 임시 디렉터리)")
+    ap.add_argument("-o", "--out", default=OUT_RESULTS, type=Path, help="결과 JSON (기본: %(default)s)")
+    ap.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus_dir or Path(tmp)
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        results = []
+        for scale in args.scales:
+            src = corpus_dir / f"corpus_{scale}x.txt"
+            if not src.exists():
+                write_corpus(src, scale)
+            for conv in args.converters:
+                # 측정마다 새 프로세스 → 최대 RSS 가 이전 측정에 오염되지 않음
+                with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as ex:
+                    r = ex.submit(run_one, conv, str(src), scale).result()
+                r["input_bytes"] = src.stat().st_size
+                results.append(r)
+                stages = "  ".join(f"{k} {v:.3f}s" for k, v in r["stages"].items())
+                print(f"{conv:<26} {scale:>4}×  {r['total_sec']:.3f}s  {r['records_per_sec']:>10,.0f} rec/s  "
+                      f"rss {r['peak_rss_kb'] / 1024:,.0f} MB  [{stages}]")
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"결과 → {args.out.as_posix()}")
+    if args.compare:
+        print(f"비교 ({args.compare.as_posix()}):")
+        compare(json.loads(args.compare.read_text(encoding="utf-8")), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+블록 단위 증분 빌드 캐시 (SQLite 사이드카) — 파싱 IR 전용
+- 키   : 블록 첫 줄(id). 같은 id 가 반복되면 '0001#2' 처럼 등장 순번을 붙임
+- 해시 : blake2b(파서 버전 + 블록 원문) → 파서 버전을 올리면 모든 엔트리가 자연히 미스 처리
+- 값   : 구조화 레코드(IR, parse_fields 결과) JSON, 파싱 실패 블록은 NULL
+         카드 HTML 은 저장하지 않음 → 템플릿만 바뀌면 재파싱 없이 IR 에서 다시 렌더
+- 순서 : ord 열에 이번 실행의 블록 순번을 기록 → records() 는 ORDER BY ord 커서 하나로 스트리밍
+- 시작 시 (key → hash, ord) 를 한 번에 읽어 두므로 블록마다 SELECT 하지 않음
+- 이번 실행에서 보이지 않은 키는 prune() 에서 삭제. ord 열이 없는 이전 형식 캐시는 비우고 다시 채움
+- prune() 이 끝나면 meta 에 version 기록 → stored_version 이 현재 version 과 같아야 캐시 전체가 이 버전의 IR
+  (--restyle 처럼 원문 없이 records() 만 쓰는 쪽은 이 값을 확인할 것)
+"""
+import hashlib, json, sqlite3
+from collections import Counter
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blocks(key TEXT PRIMARY KEY, hash TEXT NOT NULL, record TEXT, ord INTEGER);
+    CREATE INDEX IF NOT EXISTS blocks_ord ON blocks(ord);
+    CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+"""
+
+class BlockCache:
+    def __init__(self, path, version:str):
+        self.path = Path(path)
+        self.version = version
+        self.db = sqlite3.connect(self.path)
+        cols = [row[1] for row in self.db.execute("PRAGMA table_info(blocks)")]
+        if cols and "ord" not in cols:
+            self.db.execute("DROP TABLE blocks")
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+        self.stored_version = row[0] if row else None   # 마지막으로 전체 동기화(prune)한 버전
+        self._known = {k: (h, o) for k, h, o in self.db.execute("SELECT key, hash, ord FROM blocks")}
+        self._moved = []
+        self._loads = orjson.loads if orjson is not None else json.loads
+        self.hits = self.misses = self.pruned = 0
+        self._seen = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def keyed(self, blocks):
+        """블록 스트림 → (키, 블록) 스트림"""
+        seen = Counter()
+        for b in blocks:
+            head = b.split("\n", 1)[0].strip()
+            seen[head] += 1
+            yield (head if seen[head] == 1 else f"{head}#{seen[head]}"), b
+
+    def digest(self, block:str)->str:
+        return hashlib.blake2b(f"{self.version}\0{block}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def lookup(self, key:str, block:str, pos:int=0):
+        """해시가 같으면 True(적중), 다르거나 없으면 None(미스). 적중/미스 카운트 갱신.
+        pos 는 이번 실행의 블록 순번 — 적중 블록의 위치가 바뀌었으면 commit() 에서 ord 갱신"""
+        self._seen.add(key)
+        known = self._known.get(key)
+        if known and known[0] == self.digest(block):
+            self.hits += 1
+            if known[1] != pos:
+                self._moved.append((pos, key))
+            return True
+        self.misses += 1
+        return None
+
+    def store(self, key:str, block:str, rec, pos:int=0):
+        self.db.execute(
+            "INSERT OR REPLACE INTO blocks(key, hash, record, ord) VALUES (?,?,?,?)",
+            (key, self.digest(block), None if rec is None else json.dumps(rec, ensure_ascii=False), pos),
+        )
+
+    def commit(self):
+        if self._moved:
+            self.db.executemany("UPDATE blocks SET ord=? WHERE key=?", self._moved)
+            self._moved = []
+        self.db.commit()
+
+    def record(self, key:str):
+        row = self.db.execute("SELECT record FROM blocks WHERE key=?", (key,)).fetchone()
+        return self._loads(row[0]) if row and row[0] else None
+
+    def records(self):
+        """캐시된 IR 을 블록 순서대로 (파싱 실패 블록 제외)"""
+        loads = self._loads
+        for (rec,) in self.db.execute("SELECT record FROM blocks WHERE record IS NOT NULL ORDER BY ord"):
+            yield loads(rec)
+
+    def prune(self):
+        """이번 실행에 등장하지 않은 키 삭제"""
+        stale = [k for k in self._known if k not in self._seen]
+        self.db.executemany("DELETE FROM blocks WHERE key=?", ((k,) for k in stale))
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+        self.db.commit()
+        self.stored_version = self.version
+        self.pruned = len(stale)
+
+    def report(self)->str:
+        return f"캐시 {self.path.as_posix()}: 적중 {self.hits} / 재파싱 {self.misses} / 삭제 {self.pruned}"
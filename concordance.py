@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+예문 용례(KWIC) 색인 — 활용형을 표제어/원형으로 묶어 책 전체 예문에서 단어 위치를 미리 계산
+- 입력: 구조화 레코드 (원문 .txt 또는 compact 빌드, pdf2json2.iter_structured)
+- 토큰화: 영어 예문에서 [A-Za-z]+('[A-Za-z]+)* 토큰과 문자 오프셋 (소유격 's / 축약 n't 등은 떼고 원형 판정)
+- 원형화(lemmatize): 규칙 기반, 사전 = 한 단어 표제어 + 예문에 나온 모든 토큰
+  * 표제어면 그대로, 불규칙 활용표(IRREGULAR) 에 있으면 그 원형, 활용형처럼 보이는 원형(NON_INFLECTED: news 등)은 그대로
+  * 접미사 규칙으로 후보를 만듦
+    - 굴절(ies/ied→y, ing/ed→(e), d, es/s): 표제어 또는 사전에 있는 후보 채택
+    - 파생(er/est/ly, ier/iest/ily→y): 표제어인 후보만 채택 (early→ear, letter→let 같은 우연한 일치 방지)
+    - '+e' 는 3글자 이상 + 자음으로 끝나는 어간에만 (thing→the 방지)
+    - 자음 중복 제거(running→run)는 남는 어간이 자음-모음-자음으로 끝날 때만 (earring→ear 방지)
+    - 짧은 CVC 어간(car, hop)에 그대로 붙은 ing/ed 는 중복이 없으므로 '+e' 원형만 (caring→care, hoped→hope)
+    - d 는 ed 로 끝날 때만 (used→use, card→car 방지)
+  * 기능어(STOPWORDS: the/for/in ...)와 3글자 미만 후보는 버림. 아무 후보도 없으면 토큰 그대로
+- 색인: 원형 → [(문장 번호, 오프셋, 길이)], 문장 번호 → (레코드 id, 예문 번호, 예문 EN)
+- 파일(.vkwic): b"VKWC" + 버전 1바이트 + zlib( u32 메타 길이 + 메타 JSON + 문장 번호 u32[] + 오프셋 u32[] + 길이 u32[] )
+- 사용: python concordance.py build [입력] [-o vocab.vkwic]
+        python concordance.py query vocab.vkwic feeding [--width 30] [-n 20]
+"""
+import argparse, json, re, struct, sys, time, zlib
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from pdf2json2 import SRC, iter_structured
+
+MAGIC, VERSION = b"VKWC", 2
+OUT_INDEX = Path("./vocab.vkwic")
+MIN_STEM = 3
+
+WORD_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+CLITIC = re.compile(r"(?:'s|'re|'ve|'ll|'d|'m|n't|')$")
+VOWELS = frozenset("aeiou")
+NO_DOUBLE = frozenset("wxy")   # 끝 자음이 겹쳐지지 않는 글자 (fix → fixing)
+
+# 접미사를 떼면 다른 단어가 되지만 그 자체가 원형인 단어
+NON_INFLECTED = frozenset({
+    "news", "always", "perhaps", "series", "species", "thus", "physics", "economics", "politics",
+    "mathematics", "ethics", "lens", "bus", "gas", "yes", "this", "his", "its", "us", "as",
+})
+# 기능어: 원형 후보로 쓰지 않음 (thing → the, forest → for 같은 병합 방지)
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "nor", "so", "yet", "if", "as", "at", "by", "for", "from", "in",
+    "into", "of", "off", "on", "onto", "out", "over", "to", "up", "with", "than", "then", "that", "this",
+    "these", "those", "there", "here", "who", "whom", "whose", "which", "what", "when", "where", "why", "how",
+    "he", "she", "it", "we", "they", "you", "me", "him", "her", "us", "them", "my", "your", "his", "its",
+    "our", "their", "not", "no", "all", "any", "some", "each", "few", "more", "most", "own", "such",
+    "be", "am", "is", "are", "was", "were", "been", "do", "does", "did", "has", "have", "had", "can",
+    "will", "shall", "may", "might", "must", "would", "should", "could", "too", "very", "just",
+})
+
+IRREGULAR = {
+    "am": "be", "is": "be", "are": "be", "was": "be", "were": "be", "been": "be", "being": "be",
+    "has": "have", "had": "have", "having": "have", "does": "do", "did": "do", "done": "do",
+    "went": "go", "gone": "go", "goes": "go", "made": "make", "took": "take", "taken": "take",
+    "gave": "give", "given": "give", "came": "come", "saw": "see", "seen": "see", "knew": "know",
+    "known": "know", "thought": "think", "told": "tell", "said": "say", "found": "find",
+    "felt": "feel", "left": "leave", "kept": "keep", "brought": "bring", "bought": "buy",
+    "taught": "teach", "caught": "catch", "sought": "seek", "fought": "fight", "held": "hold",
+    "stood": "stand", "understood": "understand", "began": "begin", "begun": "begin",
+    "wrote": "write", "written": "write", "spoke": "speak", "spoken": "speak", "ate": "eat",
+    "eaten": "eat", "fed": "feed", "led": "lead", "met": "meet", "ran": "run", "sat": "sit",
+    "lost": "lose", "paid": "pay", "laid": "lay", "lay": "lie", "lain": "lie", "grew": "grow",
+    "grown": "grow", "drew": "draw", "drawn": "draw", "threw": "throw", "thrown": "throw",
+    "chose": "choose", "chosen": "choose", "rose": "rise", "risen": "rise", "fell": "fall",
+    "fallen": "fall", "built": "build", "sent": "send", "spent": "spend", "meant": "mean",
+    "became": "become", "forgot": "forget", "forgotten": "forget", "got": "get", "gotten": "get",
+    "children": "child", "men": "man", "women": "woman", "people": "person", "feet": "foot",
+    "teeth": "tooth", "mice": "mouse", "better": "good", "best": "good", "worse": "bad", "worst": "bad",
+}
+
+# (접미사, 붙일 문자열, 파생 접미사 여부). 위에서부터 후보를 만들고, 표제어 → 사전 순으로 채택 (파생은 표제어만)
+SUFFIX_RULES = (
+    ("ies", "y", False), ("ied", "y", False), ("ier", "y", True), ("iest", "y", True), ("ily", "y", True),
+    ("ing", "", False), ("ing", "e", False), ("ed", "", False), ("ed", "e", False), ("d", "", False),
+    ("s", "", False), ("es", "", False), ("er", "", True), ("er", "e", True), ("est", "", True),
+    ("est", "e", True), ("ly", "", True),
+)
+
+def tokens(text:str):
+    """예문 → [(소문자 토큰, 오프셋, 길이)] (축약/소유격 꼬리는 길이에 포함)"""
+    return [(m.group().lower(), m.start(), m.end() - m.start()) for m in WORD_RE.finditer(text)]
+
+def normalize_word(word:str)->str:
+    word = word.strip().lower()
+    return CLITIC.sub("", word) or word
+
+def _ends_cvc(stem:str)->bool:
+    """자음-모음-자음(w/x/y 제외)으로 끝나는지 — 활용 시 끝 자음이 겹쳐지는 모양 (run, stop, begin)"""
+    return (len(stem) >= 3 and stem[-1] not in VOWELS and stem[-1] not in NO_DOUBLE
+            and stem[-2] in VOWELS and stem[-3] not in VOWELS)
+
+def _short_cvc(stem:str)->bool:
+    """모음 덩어리가 하나인 CVC 어간 (car, hop) — 이런 어간의 ing/ed 는 자음이 겹쳐야 하므로 그대로 붙은 꼴이 아님"""
+    return _ends_cvc(stem) and len(re.findall(r"[aeiou]+", stem)) == 1
+
+def _candidates(word:str):
+    """단어 → [(후보 원형, 파생 접미사 여부)]"""
+    for suffix, add, derived in SUFFIX_RULES:
+        if not word.endswith(suffix):
+            continue
+        if suffix == "d" and not word.endswith("ed"):
+            continue
+        stem = word[:-len(suffix)]
+        if add == "e":
+            if len(stem) < MIN_STEM or stem[-1] in VOWELS or stem[-1] == "y":
+                continue
+        elif suffix in ("ing", "ed") and _short_cvc(stem):
+            continue
+        yield stem + add, derived
+        # running → run, stopped → stop, bigger → big (자음 중복 제거)
+        if not add and len(stem) > 2 and stem[-1] == stem[-2] and _ends_cvc(stem[:-1]):
+            yield stem[:-1], derived
+
+class Lemmatizer:
+    def __init__(self, headwords, lexicon=()):
+        self.headwords = frozenset(headwords)
+        self.lexicon = frozenset(lexicon) | self.headwords
+        self._memo = {}
+
+    def __call__(self, word:str)->str:
+        word = word.lower()
+        lemma = self._memo.get(word)
+        if lemma is None:
+            lemma = self._memo[word] = self._lemma(word)
+        return lemma
+
+    def _lemma(self, word):
+        word = normalize_word(word)
+        if word in self.headwords:
+            return word
+        if word in IRREGULAR:
+            return IRREGULAR[word]
+        if word in NON_INFLECTED:
+            return word
+        cands = [(c, derived) for c, derived in _candidates(word)
+                 if len(c) >= MIN_STEM and c != word and c not in STOPWORDS]
+        for c, _ in cands:
+            if c in self.headwords:
+                return c
+        for c, derived in cands:
+            if not derived and c in self.lexicon:
+                return c
+        return word
+
+class Concordance:
+    def __init__(self, sentences, lemmas, sent_ids, offsets, lengths, forms):
+        self.sentences = sentences      # 문장 번호 → (레코드 id, 예문 번호, 예문 EN)
+        self.lemmas = lemmas            # 원형 → (시작, 개수)
+        self.sent_ids = sent_ids        # array('I'), 원형별로 문장 번호 → 오프셋 순
+        self.offsets = offsets          # array('I')
+        self.lengths = lengths          # array('I')
+        self.forms = forms              # 원형 → {활용형: 빈도}
+        self._forms_rev = None
+
+    @classmethod
+    def build(cls, records):
+        sentences, toks, headwords = [], [], set()
+        for rec in records:
+            hw = rec["headword"].strip().lower()
+            if WORD_RE.fullmatch(hw):
+                headwords.add(hw)
+            for i, (en, _ko, _year, _exam) in enumerate(rec["examples"]):
+                sentences.append((rec["id"], i, en))
+                toks.append(tokens(en))
+        lemmatize = Lemmatizer(headwords, (t for ts in toks for t, _, _ in ts))
+        postings = defaultdict(list)
+        forms = defaultdict(Counter)
+        for sno, ts in enumerate(toks):
+            for tok, off, ln in ts:
+                lemma = lemmatize(tok)
+                postings[lemma].append((sno, off, ln))
+                forms[lemma][normalize_word(tok)] += 1
+        lemmas, sent_ids, offsets, lengths = {}, array("I"), array("I"), array("I")
+        for lemma in sorted(postings):
+            plist = postings[lemma]
+            lemmas[lemma] = (len(sent_ids), len(plist))
+            for sno, off, ln in plist:
+                sent_ids.append(sno)
+                offsets.append(off)   # u32 — 긴 예문/토큰도 잘리지 않음 (넘치면 array 가 OverflowError)
+                lengths.append(ln)
+        return cls(sentences, lemmas, sent_ids, offsets, lengths, {k: dict(v) for k, v in forms.items()})
+
+    def lemma_of(self, word:str)->str:
+        """질의 단어 → 색인의 원형. 색인에 이미 원형으로 있으면 그대로, 아니면 활용형 표에서 역으로 찾음"""
+        word = normalize_word(word)
+        if word in self.lemmas:
+            return word
+        return self._form_index().get(word, word)
+
+    def _form_index(self):
+        if self._forms_rev is None:
+            self._forms_rev = {f: lemma for lemma, fs in self.forms.items() for f in fs}
+        return self._forms_rev
+
+    def occurrences(self, word:str):
+        """단어(활용형 가능) → [(레코드 id, 예문 번호, 오프셋)]"""
+        entry = self.lemmas.get(self.lemma_of(word))
+        if not entry:
+            return []
+        start, count = entry
+        return [(self.sentences[s][0], self.sentences[s][1], off)
+                for s, off in zip(self.sent_ids[start:start + count], self.offsets[start:start + count])]
+
+    def kwic(self, word:str, width=30, limit=None):
+        """단어 → [(레코드 id, 예문 번호, 왼쪽 문맥, 단어, 오른쪽 문맥)]"""
+        entry = self.lemmas.get(self.lemma_of(word))
+        if not entry:
+            return []
+        start, count = entry
+        if limit is not None:
+            count = min(count, limit)
+        out = []
+        for k in range(start, start + count):
+            wid, ex, en = self.sentences[self.sent_ids[k]]
+            off, ln = self.offsets[k], self.lengths[k]
+            out.append((wid, ex, en[max(0, off - width):off], en[off:off + ln], en[off + ln:off + ln + width]))
+        return out
+
+    def save(self, path):
+        meta = {
+            "sentences": self.sentences,
+            "lemmas": [[lemma, start, count] for lemma, (start, count) in self.lemmas.items()],
+            "forms": self.forms,
+        }
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload = (struct.pack("<I", len(meta_bytes)) + meta_bytes
+                   + self.sent_ids.tobytes() + self.offsets.tobytes() + self.lengths.tobytes())
+        Path(path).write_bytes(MAGIC + bytes([VERSION]) + zlib.compress(payload, 9))
+
+    @classmethod
+    def load(cls, path):
+        raw = Path(path).read_bytes()
+        if raw[:4] != MAGIC or raw[4] != VERSION:
+            raise ValueError(f"{path}: 용례 색인 파일이 아니거나 버전이 다름")
+        payload = zlib.decompress(raw[5:])
+        (meta_len,) = struct.unpack_from("<I", payload)
+        meta = json.loads(payload[4:4 + meta_len])
+        total = sum(count for _, _, count in meta["lemmas"])
+        sent_ids, offsets, lengths = array("I"), array("I"), array("I")
+        pos = 4 + meta_len
+        for arr in (sent_ids, offsets, lengths):
+            end = pos + total * arr.itemsize
+            arr.frombytes(payload[pos:end])
+            pos = end
+        lemmas = {lemma: (start, count) for lemma, start, count in meta["lemmas"]}
+        return cls([tuple(s) for s in meta["sentences"]], lemmas, sent_ids, offsets, lengths, meta["forms"])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="예문 용례(KWIC) 색인 빌드/질의")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="구조화 레코드 → .vkwic")
+    b.add_argument("src", nargs="?", default=SRC, type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    b.add_argument("-o", "--out", default=OUT_INDEX, type=Path, help="색인 파일 (기본: %(default)s)")
+    b.add_argument("-j", "--workers", default=1, type=int, help="원문 파싱 프로세스 수")
+    q = sub.add_parser("query", help="단어(활용형 가능)의 용례 출력")
+    q.add_argument("index", type=Path)
+    q.add_argument("word")
+    q.add_argument("--width", default=30, type=int, help="좌우 문맥 글자 수 (기본: %(default)s)")
+    q.add_argument("-n", "--limit", default=20, type=int, help="최대 출력 수 (기본: %(default)s)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        t = time.perf_counter()
+        idx = Concordance.build(iter_structured(args.src, args.workers))
+        idx.save(args.out)
+        print(f"예문 {len(idx.sentences):,} / 원형 {len(idx.lemmas):,} / 출현 {len(idx.sent_ids):,}"
+              f" → {args.out.as_posix()} ({args.out.stat().st_size:,} bytes, {time.perf_counter() - t:.2f}s)")
+        return 0
+
+    idx = Concordance.load(args.index)
+    lemma = idx.lemma_of(args.word)
+    forms = idx.forms.get(lemma, {})
+    print(f"{lemma}: " + ", ".join(f"{f} {n}" for f, n in sorted(forms.items(), key=lambda x: -x[1])))
+    for wid, ex, left, kw, right in idx.kwic(args.word, args.width, args.limit):
+        print(f"{wid}#{ex}  {left:>{args.width}} [{kw}] {right}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,24 @@
-'''
+import atexit
 import json
 import re
 import datetime
 
-LOG_FILE = 'debug.log'
+LOG_FILE = 'debug.log'  # None disables logging entirely
+_log_buffer = []
 
 def log(message):
-    """Appends a message to the log file."""
-    with open(LOG_FILE, 'a', encoding='utf-8') as f:
-        f.write(f"[{datetime.datetime.now()}] {message}\n")
+    """Buffers a message for the log file (written once by flush_log)."""
+    if LOG_FILE:
+        _log_buffer.append(f"[{datetime.datetime.now()}] {message}\n")
+
+def flush_log():
+    """Appends all buffered messages to the log file in a single write."""
+    if LOG_FILE and _log_buffer:
+        with open(LOG_FILE, 'a', encoding='utf-8') as f:
+            f.writelines(_log_buffer)
+    _log_buffer.clear()
+
+atexit.register(flush_log)
 
 def create_html_content(item_id, chapter_id, headword, phonetic, content_lines):
     """
@@ -158,4 +168,4 @@ if __name__ == '__main__':
     output_file = '사랑영단어_수능_2000_upload.json'
     parse_vocab_file(input_file, output_file)
     log("...script finished.")
-'''
\ No newline at end of file
+    flush_log()
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+객관식 오답 보기(distractor) 색인 (빌드 시 사전 계산, 퀴즈 화면용)
+- 입력: 구조화 레코드의 meanings (원문 .txt / compact·shared 빌드, pdf2json2.iter_structured)
+- 품사: 첫 뜻 라인의 MEAN_TOK 토큰 (ⓥ v / ⓝ n / ⓐ a / ⓟ p / ad / pn / ~ phr), 토큰 없는 뜻은 phr(숙어)
+  같은 품사끼리만 비교 → 보기의 품사가 정답과 같아 품사만으로 답을 고를 수 없음
+- 벡터: 문자 n-gram 해시 임베딩 (희소 벡터를 고정 난수 표로 투영한 것과 같음, 코사인 근사 보존)
+  * 뜻: 토큰을 뗀 뜻 문구의 문자 2·3-gram → MEAN_DIM 차원
+  * 표제어: '<' + 소문자 표제어 + '>' 의 문자 3-gram → HW_DIM 차원 (철자가 비슷한 단어: affect/effect)
+  * 두 부분을 각각 정규화해 가중치 √w 로 이어 붙임 → 내적 = w·cos(뜻) + (1-w)·cos(표제어)
+- 이웃 계산: 품사 구간별로 CHUNK 행씩 (CHUNK × 구간 크기) 행렬곱 → argpartition 으로 상위 후보만 정렬
+  전체 N×N 유사도 행렬을 만들지 않으므로 메모리는 CHUNK × 구간 크기 float32 (10만 개에서도 수백 MB 이하)
+- 제외: 자기 자신, 같은 표제어, 뜻 문구가 하나라도 같은 단어 (정답이 될 수 있는 동의어)
+- 파일(.vqdx): b"VQDX" + 버전 1바이트 + zlib( u32 메타 길이 + 메타 JSON
+               + 품사 u8[N] + 단어장 u16[N] + 이웃 행 번호 u32[N*k] (없으면 0xFFFFFFFF) + 유사도 u8[N*k] (×255) )
+  메타: {"format", "k", "pos": [품사 이름], "notebooks": [...], "ids": [...], "headwords": [...]}
+  행 번호 = 입력 레코드 순서. 클라이언트는 (notebooks[nb], ids[행]) 으로 자기 레코드와 연결
+- 사용: python distractor_index.py build [입력] [-o vocab.vqdx] [-k 8]
+        python distractor_index.py query vocab.vqdx feed
+- numpy 필요 (pip install .[quiz])
+"""
+import argparse, json, re, struct, sys, time, zlib
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+
+from line_classifier import MEAN_TOK
+from pdf2json2 import SRC, iter_structured
+
+MAGIC, VERSION = b"VQDX", 1
+INDEX_FORMAT = "vocab-distractors/1"
+OUT_INDEX = Path("./vocab.vqdx")
+TOP_K = 8
+CHUNK = 512             # 한 번에 행렬곱할 질의 행 수
+MEAN_DIM, HW_DIM = 128, 64
+MEAN_WEIGHT = 0.75      # 뜻 유사도 비중 (나머지는 표제어 철자)
+BUCKETS = 1 << 16       # n-gram 해시 공간 (난수 표 크기 = BUCKETS × 차원)
+SEED = 20240501
+NONE = 0xFFFFFFFF
+
+POS_TOKENS = {"ⓥ": "v", "ⓝ": "n", "ⓐ": "a", "ⓟ": "p", "ad": "ad", "pn": "pn", "~": "phr"}
+POS_NAMES = ("v", "n", "a", "p", "ad", "pn", "phr")
+SPLIT = re.compile(r"\s*[,;/]\s*")
+SPACES = re.compile(r"\s+")
+
+def pos_of(line:str):
+    """뜻 라인 → (품사 이름, 토큰을 뗀 뜻 문구)"""
+    m = MEAN_TOK.match(line)
+    if not m:
+        return "phr", line.strip()
+    return POS_TOKENS.get(m.group(1).lower(), "phr"), line[m.end():].strip()
+
+def senses(meanings):
+    """뜻 라인들 → (첫 품사, 정규화한 뜻 문구 집합). 문구는 쉼표/세미콜론/슬래시로 나눔"""
+    pos, phrases = None, set()
+    for line in meanings:
+        p, text = pos_of(line)
+        pos = pos or p
+        phrases.update(SPACES.sub(" ", s) for s in SPLIT.split(text) if s)
+    return pos or "phr", phrases
+
+def ngram_hashes(text:str, sizes):
+    return [zlib.crc32(text[i:i + n].encode("utf-8")) % BUCKETS
+            for n in sizes for i in range(len(text) - n + 1)]
+
+def embed(hash_lists, table, chunk=4096):
+    """행별 n-gram 해시 리스트 → L2 정규화한 (N, dim) float32. 해시 → 난수 벡터 합을 CHUNK 행씩 reduceat 으로"""
+    out = np.zeros((len(hash_lists), table.shape[1]), np.float32)
+    for s in range(0, len(hash_lists), chunk):
+        lists = hash_lists[s:s + chunk]
+        lengths = np.fromiter(map(len, lists), np.int64, len(lists))
+        if not lengths.any():
+            continue
+        flat = np.fromiter(chain.from_iterable(lists), np.int64, int(lengths.sum()))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        rows = np.flatnonzero(lengths)
+        out[s + rows] = np.add.reduceat(table[flat], starts[rows], axis=0)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out
+
+class DistractorIndex:
+    def __init__(self, k, pos, notebooks, nb, ids, headwords, neighbors, scores):
+        self.k = k
+        self.pos = pos                  # np.uint8[N], POS_NAMES 번호
+        self.notebooks = notebooks
+        self.nb = nb                    # np.uint16[N]
+        self.ids = ids
+        self.headwords = headwords
+        self.neighbors = neighbors      # np.uint32[N, k]
+        self.scores = scores            # np.uint8[N, k]
+
+    @classmethod
+    def build(cls, records, k=TOP_K, chunk=CHUNK):
+        notebooks, nb, ids, headwords, pos, phrases = {}, [], [], [], [], []
+        mean_h, hw_h = [], []
+        for rec in records:
+            p, ph = senses(rec["meanings"])
+            nb.append(notebooks.setdefault(rec["notebook_id"], len(notebooks)))
+            ids.append(rec["id"])
+            headwords.append(rec["headword"])
+            pos.append(POS_NAMES.index(p))
+            phrases.append(ph)
+            mean_h.append(list(chain.from_iterable(ngram_hashes(f" {s} ", (2, 3)) for s in sorted(ph))))
+            hw_h.append(ngram_hashes(f"<{SPACES.sub(' ', rec['headword'].strip().lower())}>", (3,)))
+        rng = np.random.default_rng(SEED)
+        vecs = np.hstack([
+            embed(mean_h, rng.standard_normal((BUCKETS, MEAN_DIM), np.float32)) * np.float32(MEAN_WEIGHT ** 0.5),
+            embed(hw_h, rng.standard_normal((BUCKETS, HW_DIM), np.float32)) * np.float32((1 - MEAN_WEIGHT) ** 0.5),
+        ])
+        del mean_h, hw_h
+        pos = np.array(pos, np.uint8)
+        keys = [SPACES.sub(" ", h.strip().lower()) for h in headwords]
+        neighbors = np.full((len(ids), k), NONE, np.uint32)
+        scores = np.zeros((len(ids), k), np.uint8)
+        for p in range(len(POS_NAMES)):
+            rows = np.flatnonzero(pos == p)
+            if len(rows) < 2:
+                continue
+            block = vecs[rows]
+            want = min(2 * k, len(rows) - 1)    # 제외될 후보 몫까지 여유 있게
+            for s in range(0, len(rows), chunk):
+                sim = block[s:s + chunk] @ block.T
+                n = sim.shape[0]
+                sim[np.arange(n), s + np.arange(n)] = -np.inf
+                top = np.argpartition(-sim, want - 1, axis=1)[:, :want]
+                top_sim = np.take_along_axis(sim, top, axis=1)
+                order = np.argsort(-top_sim, axis=1, kind="stable")
+                top, top_sim = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_sim, order, axis=1)
+                for r in range(n):
+                    me = rows[s + r]
+                    out = 0
+                    for c, score in zip(rows[top[r]].tolist(), top_sim[r].tolist()):
+                        if keys[c] == keys[me] or not phrases[c].isdisjoint(phrases[me]):
+                            continue
+                        neighbors[me, out] = c
+                        scores[me, out] = round(max(score, 0.0) * 255)
+                        out += 1
+                        if out == k:
+                            break
+        return cls(k, pos, list(notebooks), np.array(nb, np.uint16), ids, headwords, neighbors, scores)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def find(self, query:str):
+        """id 또는 표제어(대소문자 무시) → 행 번호 리스트"""
+        q = SPACES.sub(" ", query.strip().lower())
+        return [i for i, (rid, hw) in enumerate(zip(self.ids, self.headwords))
+                if rid == query or SPACES.sub(" ", hw.strip().lower()) == q]
+
+    def distractors(self, row:int):
+        """행 번호 → [(행 번호, 유사도 0..1), ...] 유사도 내림차순"""
+        return [(int(c), int(s) / 255) for c, s in zip(self.neighbors[row], self.scores[row]) if c != NONE]
+
+    def save(self, path):
+        meta = {"format": INDEX_FORMAT, "k": self.k, "pos": list(POS_NAMES), "notebooks": self.notebooks,
+                "ids": self.ids, "headwords": self.headwords}
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload = (struct.pack("<I", len(meta_bytes)) + meta_bytes + self.pos.tobytes()
+                   + self.nb.astype("<u2").tobytes() + self.neighbors.astype("<u4").tobytes() + self.scores.tobytes())
+        Path(path).write_bytes(MAGIC + bytes([VERSION]) + zlib.compress(payload, 9))
+
+    @classmethod
+    def load(cls, path):
+        raw = Path(path).read_bytes()
+        if raw[:4] != MAGIC or raw[4] != VERSION:
+            raise ValueError(f"{path}: 오답 보기 색인 파일이 아니거나 버전이 다름")
+        payload = zlib.decompress(raw[5:])
+        (meta_len,) = struct.unpack_from("<I", payload)
+        meta = json.loads(payload[4:4 + meta_len])
+        n, k = len(meta["ids"]), meta["k"]
+        pos = 4 + meta_len
+        arrays = []
+        for dtype, count in (("u1", n), ("<u2", n), ("<u4", n * k), ("u1", n * k)):
+            a = np.frombuffer(payload, dtype, count, pos)
+            arrays.append(a)
+            pos += a.nbytes
+        p, nb, neighbors, scores = arrays
+        return cls(k, p, meta["notebooks"], nb, meta["ids"], meta["headwords"],
+                   neighbors.reshape(n, k), scores.reshape(n, k))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="객관식 오답 보기 색인 빌드/질의")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="구조화 레코드 → .vqdx")
+    b.add_argument("src", nargs="?", default=SRC, type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    b.add_argument("-o", "--out", default=OUT_INDEX, type=Path, help="색인 파일 (기본: %(default)s)")
+    b.add_argument("-j", "--workers", default=1, type=int, help="원문 파싱 프로세스 수")
+    b.add_argument("-k", default=TOP_K, type=int, help="단어당 보기 후보 수 (기본: %(default)s)")
+    b.add_argument("--chunk", default=CHUNK, type=int, help="행렬곱 질의 행 묶음 (기본: %(default)s)")
+    q = sub.add_parser("query", help="단어의 오답 보기 후보 출력")
+    q.add_argument("index", type=Path)
+    q.add_argument("word", help="표제어 또는 id")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        t = time.perf_counter()
+        idx = DistractorIndex.build(iter_structured(args.src, args.workers), args.k, args.chunk)
+        idx.save(args.out)
+        filled = int((idx.neighbors != NONE).sum())
+        counts = np.bincount(idx.pos, minlength=len(POS_NAMES))
+        print(f"단어 {len(idx):,} ({', '.join(f'{p} {c:,}' for p, c in zip(POS_NAMES, counts) if c)})"
+              f" / 보기 {filled:,} (단어당 평균 {filled / max(len(idx), 1):.1f})"
+              f" → {args.out.as_posix()} ({args.out.stat().st_size:,} bytes, {time.perf_counter() - t:.2f}s)")
+        return 0
+
+    idx = DistractorIndex.load(args.index)
+    rows = idx.find(args.word)
+    if not rows:
+        print(f"'{args.word}' 없음")
+        return 1
+    for row in rows:
+        print(f"{idx.headwords[row]} #{idx.ids[row]} [{POS_NAMES[idx.pos[row]]}] ({idx.notebooks[idx.nb[row]]})")
+        for rank, (c, score) in enumerate(idx.distractors(row), 1):
+            print(f"  {rank:>2}. {idx.headwords[c]:<24} {score:.2f}  #{idx.ids[c]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
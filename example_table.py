@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+공유 예문 표 (표제어 간 예문 중복 제거, 내용 주소 방식)
+- 예문 id = blake2b(en + \\0 + ko) 앞 ID_LEN 글자 → 같은 EN/KO 쌍은 어느 책/표제어에서 나와도 같은 id
+  (다른 쌍이 같은 id 가 되면 빌드 중단 — 사실상 일어나지 않지만 조용히 섞이지 않도록)
+- 단어 레코드(--format shared): 구조화 레코드와 같고 examples 만 참조로 바뀜
+    "examples": [[예문 id, "YY"|null, "모고"|"수능"|null], ...]
+  연도 태그는 출제 정보라 참조 쪽에 둠 (같은 문장이 다른 시험에 나와도 한 행)
+- 표 파일: {"format": "vocab-examples/1", "count": n, "refs": 참조 수, "examples": {id: [en, ko|null], ...}} (첫 등장 순서)
+  번역 오류는 표의 행 하나만 고치면 그 예문을 쓰는 모든 카드에 반영됨
+- expand(rec): 공유 레코드 → 구조화 레코드. render_card/to_html_record 결과는 다른 포맷과 바이트 동일
+- 빌드 출력 옆 <출력 이름>.examples.json 이 기본 위치 (pdf2json2 --format shared, main.py 는 출력 디렉터리의 examples.json)
+  읽는 쪽은 find_table(빌드) 로 두 위치를 차례로 찾고, expand_records 로 공유 레코드만 펼침
+- 사용: python example_table.py [입력 ...] — 여러 책을 합쳤을 때의 중복 제거 리포트
+"""
+import argparse, hashlib, json, sys
+from pathlib import Path
+
+EXAMPLES_FORMAT = "vocab-examples/1"
+SHARED_TABLE = "examples.json"   # main.py 출력 디렉터리의 책 공용 예문 표
+ID_LEN = 12   # hex 12자 = 48비트. 예문 10만 개에서도 충돌 확률 1e-4 미만
+
+def example_id(en:str, ko)->str:
+    return hashlib.blake2b(f"{en}\0{ko or ''}".encode("utf-8"), digest_size=ID_LEN // 2).hexdigest()
+
+def examples_path(out)->Path:
+    """빌드 출력 경로 → 기본 예문 표 경로 (vocab.json → vocab.examples.json)"""
+    out = Path(out)
+    return out.with_name(out.stem + ".examples.json")
+
+def find_table(build):
+    """빌드 파일 → 예문 표 경로 (<이름>.examples.json, 없으면 같은 디렉터리의 examples.json). 없으면 None"""
+    build = Path(build)
+    for path in (examples_path(build), build.with_name(SHARED_TABLE)):
+        if path.is_file():
+            return path
+    return None
+
+def is_shared(rec)->bool:
+    """예문이 [예문 id, 연도, 시험] 참조인 공유 레코드인지"""
+    return any(len(ex) == 3 for ex in rec.get("examples") or ())
+
+def expand_records(records, table, source=""):
+    """레코드 스트림에서 공유 레코드만 table 로 펼침. 공유 레코드인데 표가 없으면 ValueError"""
+    for rec in records:
+        if is_shared(rec):
+            if table is None:
+                raise ValueError(f"{source}: shared 빌드인데 예문 표가 없음 ({SHARED_TABLE} 또는 <이름>.examples.json)")
+            rec = table.expand(rec)
+        yield rec
+
+class ExampleTable:
+    def __init__(self, examples=None):
+        self.examples = dict(examples or {})   # id → [en, ko]
+        self.refs = 0
+
+    def __len__(self):
+        return len(self.examples)
+
+    def intern(self, en:str, ko)->str:
+        eid = example_id(en, ko)
+        row = self.examples.setdefault(eid, [en, ko])
+        if row[0] != en or row[1] != ko:
+            raise ValueError(f"예문 id 충돌 {eid}: {row[0]!r} / {en!r}")
+        self.refs += 1
+        return eid
+
+    def share(self, rec):
+        """구조화 레코드 → 공유 레코드 (examples 를 예문 id 참조로)"""
+        out = dict(rec)
+        out["examples"] = [[self.intern(en, ko), year, exam] for en, ko, year, exam in rec["examples"]]
+        return out
+
+    def tee(self, records):
+        return map(self.share, records)
+
+    def expand(self, rec):
+        """공유 레코드 → 구조화 레코드"""
+        out = dict(rec)
+        out["examples"] = [[*self.examples[eid], year, exam] for eid, year, exam in rec["examples"]]
+        return out
+
+    def ratio(self)->float:
+        """중복 제거 비율: 1 - 고유 예문 / 참조 수"""
+        return 1 - len(self) / self.refs if self.refs else 0.0
+
+    def report(self)->str:
+        return f"예문 참조 {self.refs:,} → 고유 {len(self):,} (중복 제거 {self.ratio():.1%})"
+
+    def write(self, path):
+        doc = {"format": EXAMPLES_FORMAT, "count": len(self), "refs": self.refs, "examples": self.examples}
+        Path(path).write_text(json.dumps(doc, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path):
+        doc = json.loads(Path(path).read_text(encoding="utf-8"))
+        if doc.get("format") != EXAMPLES_FORMAT:
+            raise ValueError(f"{path}: 예문 표 형식이 아님 ({doc.get('format')})")
+        table = cls(doc["examples"])
+        table.refs = doc.get("refs", 0)
+        return table
+
+def main(argv=None):
+    from pdf2json2 import SRC, iter_structured   # pdf2json2 가 이 모듈을 import 하므로 CLI 에서만
+    from json_output import record_encoder
+    ap = argparse.ArgumentParser(description="공유 예문 표 중복 제거 리포트 (여러 책을 합친 기준)")
+    ap.add_argument("src", nargs="*", default=[SRC], type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    ap.add_argument("-o", "--out", type=Path, help="예문 표도 저장 (예: examples.json)")
+    args = ap.parse_args(argv)
+
+    table = ExampleTable()
+    encode = record_encoder("compact")
+    before = after = 0
+    for src in args.src:
+        for rec in iter_structured(src):
+            before += len(encode(rec))
+            after += len(encode(table.share(rec)))
+    table_size = len(json.dumps(table.examples, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    print(table.report())
+    print(f"레코드 {before:,} bytes → 레코드 {after:,} + 예문 표 {table_size:,} bytes"
+          f" ({1 - (after + table_size) / before:.1%} 감소)" if before else "레코드 없음")
+    if args.out:
+        table.write(args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
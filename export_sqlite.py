@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+빌드 JSON → PWA 용 vocab.db (SQLite) 직접 생성
+- 스키마: VocabPWA/src/stores/db.ts 의 CREATE TABLE 문 그대로 (notebooks/chapters/words/word_status/stats_daily)
+- 매핑 : study.ts restoreJSON/insertObjects 와 동일
+  * notebooks.name = notebook_id, chapters.name = chapter_id 문자열 (예: "01"), order_index = 챕터 번호
+  * headword 가 비었거나 (노트북, 챕터, headword) 가 중복이면 건너뜀
+  * word_status 는 비워 둠 (클라이언트가 학습 시 생성)
+- 적재: 한 트랜잭션 안에서 executemany 일괄 INSERT, 저널/동기화 끈 PRAGMA, 마지막에 VACUUM
+- 결과 파일은 그대로 IndexedDB(idbPut('vocab.db', ...)) 에 넣어 쓸 수 있음
+- 입력은 json_output.iter_build 로 레코드 단위 스트리밍 (pretty/compact/NDJSON). compact 빌드는 html 로 렌더링,
+  shared 빌드는 옆의 예문 표로 펼침
+- 사용: python export_sqlite.py [빌드.json] [-o vocab.db]
+"""
+import argparse, os, sqlite3
+from pathlib import Path
+
+from example_table import ExampleTable, expand_records, find_table
+from json_output import iter_build
+
+SRC_JSON = Path("./사랑영단어_수능2000_styled_final.json")
+OUT_DB   = Path("./vocab.db")
+
+# db.ts getDB() 와 동일하게 유지할 것
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS notebooks(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      name TEXT NOT NULL,
+      created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS chapters(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      notebook_id INTEGER REFERENCES notebooks(id) ON DELETE CASCADE,
+      name TEXT,
+      order_index INTEGER DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS words(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      notebook_id INTEGER REFERENCES notebooks(id) ON DELETE SET NULL,
+      chapter_id INTEGER REFERENCES chapters(id) ON DELETE SET NULL,
+      headword TEXT NOT NULL,
+      phonetic TEXT,
+      html_content TEXT,
+      tags TEXT,
+      created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+      updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS word_status(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      word_id INTEGER REFERENCES words(id) ON DELETE CASCADE,
+      status TEXT DEFAULT 'NEW',
+      last_reviewed_at TEXT,
+      next_due_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS stats_daily(
+      date TEXT PRIMARY KEY,
+      learned_count INTEGER DEFAULT 0
+    );
+"""
+
+# 새 파일을 한 번에 채우는 용도이므로 내구성보다 적재 속도 우선
+LOAD_PRAGMAS = """
+    PRAGMA page_size=4096;
+    PRAGMA journal_mode=OFF;
+    PRAGMA synchronous=OFF;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA foreign_keys=OFF;
+"""
+
+def load_records(path):
+    """빌드(JSON 배열 / NDJSON, html·compact·shared) → html 레코드 스트림 (pdf2json2 --sqlite 와 같은 내용)"""
+    from pdf2json2 import to_html_record   # pdf2json2 가 이 모듈을 import 하므로 여기서만
+    table = ExampleTable.load(found) if (found := find_table(path)) else None
+    for rec in expand_records(iter_build(path), table, path):
+        yield to_html_record(rec) if "meanings" in rec else rec
+
+def export_db(records, path):
+    """레코드 스트림을 path 의 새 SQLite 파일로 저장. (notebooks, chapters, words) 개수 반환.
+    notebooks/chapters id 는 AUTOINCREMENT 순서대로 미리 배정해 words 를 한 번의 executemany 로 넣는다."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    notebooks, chapters, seen = {}, {}, set()
+
+    def word_rows():
+        for w in records:
+            headword = (w.get("headword") or "").strip()
+            if not headword:
+                continue
+            nb_name = w.get("notebook_id") or "Imported"
+            ch_name = str(w["chapter_id"]) if w.get("chapter_id") else "default"
+            nb = notebooks.setdefault(nb_name, len(notebooks) + 1)
+            ch = chapters.setdefault((nb, ch_name), len(chapters) + 1)
+            key = (nb, ch, w.get("headword"))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield nb, ch, w.get("headword"), w.get("phonetic") or None, w.get("html_content") or "", w.get("tags") or None
+
+    db = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        db.executescript(LOAD_PRAGMAS + SCHEMA)
+        db.execute("BEGIN")
+        db.executemany(
+            "INSERT INTO words(notebook_id, chapter_id, headword, phonetic, html_content, tags) VALUES (?, ?, ?, ?, ?, ?)",
+            word_rows(),
+        )
+        db.executemany("INSERT INTO notebooks(id, name) VALUES (?, ?)", ((i, n) for n, i in notebooks.items()))
+        db.executemany(
+            "INSERT INTO chapters(id, notebook_id, name, order_index) VALUES (?, ?, ?, ?)",
+            ((i, nb, name, int(name) if name.isdigit() else 0) for (nb, name), i in chapters.items()),
+        )
+        db.execute("COMMIT")
+        db.execute("VACUUM")
+    except BaseException:
+        db.close()
+        tmp.unlink(missing_ok=True)   # 레코드 스트림 오류 시 반쯤 채운 .tmp 를 남기지 않음
+        raise
+    db.close()
+    os.replace(tmp, path)
+    return len(notebooks), len(chapters), len(seen)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="빌드 JSON → PWA 스키마 SQLite(vocab.db)")
+    ap.add_argument("src", nargs="?", default=SRC_JSON, type=Path, help="입력 빌드 JSON/NDJSON (기본: %(default)s)")
+    ap.add_argument("-o", "--out", default=OUT_DB, type=Path, help="출력 DB (기본: %(default)s)")
+    args = ap.parse_args(argv)
+    try:
+        nb, ch, n = export_db(load_records(args.src), args.out)
+    except ValueError as e:   # 깨진 JSON / 예문 표 없는 shared 빌드
+        ap.error(str(e))
+    print(f"notebooks {nb} / chapters {ch} / words {n} → {args.out.as_posix()} ({args.out.stat().st_size:,} bytes)")
+
+if __name__ == "__main__":
+    main()
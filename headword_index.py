@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+표제어 자동완성 + 오타 허용 검색 색인 (빌드 시 사전 계산)
+- 입력: 구조화 레코드 (원문 .txt 또는 compact 빌드, pdf2json2.iter_structured)
+- 키: 소문자 + 공백 정규화한 표제어 ('As  if' → 'as if'). 같은 키의 레코드 id 는 함께 묶음
+- 자동완성: 정렬된 키 배열에서 bisect 로 접두어 구간을 찾아 앞에서 k 개
+- 오타 허용: SymSpell 방식 삭제 사전
+  * 키 앞 PREFIX_LEN 글자에서 최대 MAX_EDIT 글자를 지운 문자열의 crc32 → 키 번호 목록
+    (지운 글자 수별 구간으로 나눠 저장 → 허용 편집 수가 작은 질의는 앞 구간만 읽음)
+  * 질의도 같은 방식으로 지운 문자열들을 만들어 후보를 모으고, 전체 키와의
+    Damerau-Levenshtein(OSA) 거리를 비트 병렬로 계산해 MAX_EDIT 이내만 남김
+  * 허용 편집 수는 질의 길이에 따라 0/1/2 (auto_edits)
+  * 문자열 대신 해시 정렬 배열 + bisect → 수백만 개 문자열 객체 없이 로드 즉시 조회 (GC 부담 없음)
+    해시 충돌은 후보가 조금 늘 뿐 거리 검증에서 걸러짐
+- 파일(.vhwx): b"VHWX" + 버전 1바이트 + zlib( u32 메타 길이 + 메타 JSON + 해시 u32[] + 구간 u32[] + 키 번호 u32[] )
+- 사용: python headword_index.py build [입력] [-o vocab.vhwx]
+        python headword_index.py query vocab.vhwx acept [-k 10]
+"""
+import argparse, json, re, struct, sys, time, zlib
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from pdf2json2 import SRC, iter_structured
+
+MAGIC, VERSION = b"VHWX", 1
+OUT_INDEX = Path("./vocab.vhwx")
+MAX_EDIT = 2
+PREFIX_LEN = 7       # 삭제 사전은 앞 7글자만 사용 (긴 표제어/숙어도 키당 삭제 문자열 수 상한 29개)
+
+def auto_edits(query:str)->int:
+    """질의 길이별 허용 편집 수: 1~2글자 0, 3~5글자 1, 그 이상 MAX_EDIT (짧은 질의의 후보 폭증 방지)"""
+    return 0 if len(query) <= 2 else 1 if len(query) <= 5 else MAX_EDIT
+
+SPACES = re.compile(r"\s+")
+
+def normalize(text:str)->str:
+    return SPACES.sub(" ", text.strip().lower())
+
+def deletes(word:str, max_edit=MAX_EDIT):
+    """word 에서 0~max_edit 글자를 지운 문자열 → 지운 글자 수"""
+    out = {word: 0}
+    level = {word}
+    for n in range(1, max_edit + 1):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+        for w in level:
+            out.setdefault(w, n)
+    return out
+
+def del_hash(text:str)->int:
+    return zlib.crc32(text.encode("utf-8"))
+
+def edit_distance(a:str, b:str, limit=MAX_EDIT):
+    """제한 Damerau-Levenshtein(OSA) 거리. limit 을 넘으면 limit + 1
+    비트 병렬(Myers/Hyyrö, 전치 포함): a 의 글자 위치를 비트마스크로 두고 b 한 글자당 정수 연산 몇 번"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a:
+        return min(len(b), limit + 1)
+    peq = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    full, top = (1 << len(a)) - 1, 1 << (len(a) - 1)
+    vp, vn, d0, prev_eq, score = full, 0, 0, 0, len(a)
+    for c in b:
+        eq = peq.get(c, 0)
+        tr = ((~d0 & eq) << 1) & prev_eq
+        d0 = ((((eq & vp) + vp) ^ vp) | eq | vn | tr) & full
+        hp = vn | (~(d0 | vp) & full)
+        hn = d0 & vp
+        if hp & top:
+            score += 1
+        elif hn & top:
+            score -= 1
+        hp = ((hp << 1) | 1) & full
+        hn = (hn << 1) & full
+        vp = hn | (~(d0 | hp) & full)
+        vn = d0 & hp
+        prev_eq = eq
+    return min(score, limit + 1)
+
+class HeadwordIndex:
+    SPAN = MAX_EDIT + 1
+
+    def __init__(self, keys, headwords, ids, hashes, bounds, postings):
+        self.keys = keys                # 정렬된 정규화 키
+        self.headwords = headwords      # 키 번호 → 원래 표기 (처음 나온 것)
+        self.ids = ids                  # 키 번호 → [레코드 id, ...]
+        self.hashes = hashes            # array('I'), 정렬된 삭제 문자열 해시
+        self.bounds = bounds            # array('I'), hashes[i] 의 지운 글자 수 L 구간 시작 = bounds[i * SPAN + L]
+        self.postings = postings        # array('I'), 키 번호
+
+    @classmethod
+    def build(cls, records):
+        by_key = {}
+        for rec in records:
+            key = normalize(rec["headword"])
+            if key:
+                by_key.setdefault(key, (rec["headword"], []))[1].append(rec["id"])
+        keys = sorted(by_key)
+        table = defaultdict(lambda: [[] for _ in range(cls.SPAN)])   # 해시 → 지운 글자 수별 키 번호
+        for n, key in enumerate(keys):
+            for d, level in deletes(key[:PREFIX_LEN]).items():
+                table[del_hash(d)][level].append(n)
+        hashes, bounds, postings = array("I", sorted(table)), array("I"), array("I")
+        for h in hashes:
+            for plist in table[h]:
+                bounds.append(len(postings))
+                postings.extend(plist)
+        bounds.append(len(postings))
+        return cls(keys, [by_key[k][0] for k in keys], [by_key[k][1] for k in keys], hashes, bounds, postings)
+
+    def _entry(self, n, dist):
+        return self.headwords[n], self.ids[n], dist
+
+    def complete(self, prefix:str, k=10):
+        """접두어 자동완성 → [(headword, [id], 0)] 키 사전순 (정확히 일치하는 키가 맨 앞)"""
+        p = normalize(prefix)
+        if not p:
+            return []
+        out = []
+        for n in range(bisect_left(self.keys, p), len(self.keys)):
+            if len(out) == k or not self.keys[n].startswith(p):
+                break
+            out.append(self._entry(n, 0))
+        return out
+
+    def fuzzy(self, query:str, k=10, max_edit=None):
+        """오타 허용 일치 → [(headword, [id], 편집 거리)] 거리 → 길이 차 → 사전순
+        max_edit 을 생략하면 질의 길이에 따라 auto_edits"""
+        q = normalize(query)
+        if not q:
+            return []
+        if max_edit is None:
+            max_edit = auto_edits(q)
+        cands = set()
+        for d in deletes(q[:PREFIX_LEN], max_edit):
+            h = del_hash(d)
+            i = bisect_left(self.hashes, h)
+            if i < len(self.hashes) and self.hashes[i] == h:
+                # 질의 쪽에서 max_edit 글자까지 지웠으므로 키 쪽도 max_edit 이하 구간만
+                cands.update(self.postings[self.bounds[i * self.SPAN]:self.bounds[i * self.SPAN + max_edit + 1]])
+        scored = []
+        for n in cands:
+            dist = edit_distance(q, self.keys[n], max_edit)
+            if dist <= max_edit:
+                scored.append((dist, abs(len(self.keys[n]) - len(q)), self.keys[n], n))
+        scored.sort()
+        return [self._entry(n, dist) for dist, _, _, n in scored[:k]]
+
+    def lookup(self, query:str, k=10):
+        """자동완성 결과를 먼저, 모자라면 오타 허용 결과로 채움"""
+        out = self.complete(query, k)
+        if len(out) < k:
+            seen = {hw for hw, _, _ in out}
+            out += [e for e in self.fuzzy(query, k) if e[0] not in seen][:k - len(out)]
+        return out
+
+    def save(self, path):
+        meta = {
+            "keys": self.keys,
+            "headwords": self.headwords,
+            "ids": self.ids,
+            "hashes": len(self.hashes),
+        }
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload = (struct.pack("<I", len(meta_bytes)) + meta_bytes
+                   + self.hashes.tobytes() + self.bounds.tobytes() + self.postings.tobytes())
+        Path(path).write_bytes(MAGIC + bytes([VERSION]) + zlib.compress(payload, 9))
+
+    @classmethod
+    def load(cls, path):
+        raw = Path(path).read_bytes()
+        if raw[:4] != MAGIC or raw[4] != VERSION:
+            raise ValueError(f"{path}: 표제어 색인 파일이 아니거나 버전이 다름")
+        payload = zlib.decompress(raw[5:])
+        (meta_len,) = struct.unpack_from("<I", payload)
+        meta = json.loads(payload[4:4 + meta_len])
+        hashes, bounds, postings = array("I"), array("I"), array("I")
+        pos = 4 + meta_len
+        end = pos + meta["hashes"] * hashes.itemsize
+        hashes.frombytes(payload[pos:end])
+        pos, end = end, end + (meta["hashes"] * cls.SPAN + 1) * bounds.itemsize
+        bounds.frombytes(payload[pos:end])
+        postings.frombytes(payload[end:])
+        return cls(meta["keys"], meta["headwords"], meta["ids"], hashes, bounds, postings)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="표제어 자동완성/오타 허용 색인 빌드/질의")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="구조화 레코드 → .vhwx")
+    b.add_argument("src", nargs="?", default=SRC, type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    b.add_argument("-o", "--out", default=OUT_INDEX, type=Path, help="색인 파일 (기본: %(default)s)")
+    b.add_argument("-j", "--workers", default=1, type=int, help="원문 파싱 프로세스 수")
+    q = sub.add_parser("query", help="색인 질의 (자동완성 → 오타 허용)")
+    q.add_argument("index", type=Path)
+    q.add_argument("query")
+    q.add_argument("-k", default=10, type=int)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        t = time.perf_counter()
+        idx = HeadwordIndex.build(iter_structured(args.src, args.workers))
+        idx.save(args.out)
+        print(f"표제어 {len(idx.keys):,} / 삭제 해시 {len(idx.hashes):,} / 포스팅 {len(idx.postings):,}"
+              f" → {args.out.as_posix()} ({args.out.stat().st_size:,} bytes, {time.perf_counter() - t:.2f}s)")
+        return 0
+
+    idx = HeadwordIndex.load(args.index)
+    t = time.perf_counter()
+    results = idx.lookup(args.query, args.k)
+    ms = (time.perf_counter() - t) * 1000
+    for rank, (hw, ids, dist) in enumerate(results, 1):
+        print(f"{rank:>3}. {hw:<24} 거리 {dist}  {', '.join(ids)}")
+    print(f"({len(results)}건, {ms:.3f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+레코드 스트리밍 JSON 출력 계층
+- 레이아웃
+  * pretty : json.dumps(items, ensure_ascii=False, indent=2) 와 바이트 동일한 배열
+  * compact: 들여쓰기 없는 배열, 레코드당 한 줄 ("[rec,\\nrec,...]")
+  * ndjson : 레코드당 한 줄, 배열 괄호 없음 (줄 끝 \\n)
+- 직렬화 백엔드
+  * orjson 이 설치되어 있으면 사용, 없으면 표준 json 으로 대체 (--serializer 로 강제 가능)
+  * 두 백엔드 모두 같은 입력이면 같은 바이트를 냄 (문자열/정수/null/리스트/딕셔너리 레코드 기준)
+- 레코드를 받는 즉시 바이너리 버퍼로 기록 → 전체 문서를 메모리에 만들지 않음
+- 임시 파일에 쓴 뒤 교체하므로 중간 실패 시 기존 결과물이 보존됨
+- 읽기: iter_array(배열, READ_CHUNK 씩 raw_decode) / iter_ndjson(줄 단위) / iter_build(첫 글자로 판별)
+  모두 레코드 하나씩 yield → 빌드 전체를 메모리에 올리지 않음
+"""
+import json, os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LAYOUTS = ("pretty", "compact", "ndjson")
+WRITE_BUFFER = 1 << 20
+READ_CHUNK = 1 << 20
+
+# (첫 레코드 앞, 레코드 사이, 끝, 빈 배열)
+FRAMES = {
+    "pretty":  (b"[\n  ", b",\n  ", b"\n]", b"[]"),
+    "compact": (b"[", b",\n", b"]", b"[]"),
+    "ndjson":  (b"", b"\n", b"\n", b""),
+}
+
+# json.dumps(**kwargs) 는 호출마다 인코더를 새로 만들므로 한 번 만들어 재사용
+_STD_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_STD_PRETTY  = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+def _std_compact(rec):
+    return _STD_COMPACT(rec).encode("utf-8")
+
+def _std_pretty(rec):
+    return _STD_PRETTY(rec).replace("\n", "\n  ").encode("utf-8")
+
+def _orjson_compact(rec):
+    return orjson.dumps(rec)
+
+def _orjson_pretty(rec):
+    return orjson.dumps(rec, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ")
+
+BACKENDS = {
+    "json": (_std_compact, _std_pretty),
+}
+if orjson is not None:
+    BACKENDS["orjson"] = (_orjson_compact, _orjson_pretty)
+
+def resolve_backend(name="auto")->str:
+    if name == "auto":
+        return "orjson" if "orjson" in BACKENDS else "json"
+    if name not in BACKENDS:
+        raise ValueError(f"serializer '{name}' 를 쓸 수 없음 (사용 가능: {', '.join(BACKENDS)})")
+    return name
+
+def record_encoder(layout="pretty", backend="auto"):
+    """레이아웃에 맞는 레코드 → bytes 함수 (pretty 는 배열 안 들여쓰기 포함)"""
+    compact, pretty = BACKENDS[resolve_backend(backend)]
+    return pretty if layout == "pretty" else compact
+
+class JsonWriter:
+    """레코드를 하나씩 받아 pretty/compact 배열 또는 NDJSON 으로 기록"""
+    def __init__(self, path, layout="pretty", backend="auto"):
+        if layout not in FRAMES:
+            raise ValueError(f"알 수 없는 레이아웃: {layout}")
+        self.path = Path(path)
+        self.layout = layout
+        self.encode = record_encoder(layout, backend)
+        self.first, self.sep, self.end, self.empty = FRAMES[layout]
+        self.count = 0
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._f = open(self._tmp, "wb", buffering=WRITE_BUFFER)
+
+    def write(self, rec):
+        self._f.write((self.sep if self.count else self.first) + self.encode(rec))
+        self.count += 1
+
+    def close(self):
+        self._f.write(self.end if self.count else self.empty)
+        self._f.close()
+        os.replace(self._tmp, self.path)
+        return self.count
+
+    def abort(self):
+        self._f.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+def write_records(records, path, layout="pretty", backend="auto"):
+    """레코드 스트림 전체를 path 에 기록하고 레코드 수 반환"""
+    with JsonWriter(path, layout, backend) as w:
+        for rec in records:
+            w.write(rec)
+    return w.count
+
+def iter_ndjson(path):
+    """NDJSON 파일을 한 줄씩 읽어 레코드 yield"""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+def sniff_layout(path)->str:
+    """기존 빌드의 레이아웃 추정: '[\\n  ' 로 시작하면 pretty, 그 밖의 '[' 는 compact, 아니면 ndjson"""
+    with open(path, encoding="utf-8") as f:
+        head = f.read(64).lstrip("\ufeff \t\r\n")
+    if not head.startswith("["):
+        return "ndjson"
+    return "pretty" if head.startswith("[\n  ") else "compact"
+
+def iter_array(path):
+    """JSON 배열 파일을 READ_CHUNK 글자씩 읽어 원소를 하나씩 yield (메모리 = 청크 + 레코드 하나)"""
+    decode = json.JSONDecoder().raw_decode
+    with open(path, encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def peek():
+            """공백을 건너뛴 다음 글자 (필요하면 더 읽음). 파일 끝이면 ''"""
+            nonlocal buf, pos, eof
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n\ufeff":
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return buf[pos:pos + 1]
+                buf, pos = f.read(READ_CHUNK), 0
+                eof = not buf
+
+        if peek() != "[":
+            raise ValueError(f"{path}: JSON 배열이 아님")
+        pos += 1
+        if peek() == "]":
+            return
+        while True:
+            try:
+                item, end = decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(READ_CHUNK)       # 레코드가 청크 경계에 걸림 → 이어 읽고 다시
+                buf, pos, eof = buf[pos:] + more, 0, not more
+                continue
+            yield item
+            pos = end
+            c = peek()
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError(f"{path}: 배열 구분자 오류 ({c or 'EOF'!r})")
+            pos += 1
+            peek()
+
+def iter_build(path):
+    """빌드 파일(JSON 배열 / NDJSON) → 레코드 스트림. 확장자가 아니라 첫 글자로 판별"""
+    return iter_ndjson(path) if sniff_layout(path) == "ndjson" else iter_array(path)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+단어 블록 라인 분류기 (변환기 공용 코어)
+- 각 라인을 한 번만 스캔해서 라벨을 붙임 (strip 1회 + 필요한 정규식만 1회씩)
+  * MEANING : ⓥ/ⓝ/ⓐ/ⓟ/ad/pn/~ 로 시작하고 한글 포함
+  * EN      : 영문자로 시작 (MEANING 제외)
+  * KO      : 한글 포함 (MEANING/EN 제외)
+  * OTHER   : 위 어느 것도 아님 (0)
+  * ID/PHON : 헤더 판정용 플래그. 위 라벨과 OR 로 겹칠 수 있음 (예: '[참고]' → PHON|KO)
+- EN 라인은 같은 패스에서 끝의 연도 태그(YY모고|YY수능) 매치도 함께 계산
+- 결과: (label, 양끝 공백 제거 텍스트, 연도 매치 | None) 튜플의 리스트
+  이후 단계(의미/예문 병합 상태기계)는 라벨만 보고 진행하면 됨
+"""
+import re
+
+ID, PHON, MEANING, EN, KO = 1, 2, 4, 8, 16
+OTHER = 0
+KINDS = MEANING | EN | KO
+LABEL_NAMES = {ID: "ID", PHON: "PHON", MEANING: "MEANING", EN: "EN", KO: "KO"}
+
+ID_RE      = re.compile(r"^\d{4}$")
+PHON_RE    = re.compile(r"^\[.*?\]$")
+HANGUL_RE  = re.compile(r"[\uac00-\ud7a3]")
+YEAR_TAIL  = re.compile(r"(?:\s|-)?(\d{2})(모고|수능)\s*$")
+MEAN_TOK   = re.compile(r"^\s*(ⓥ|ⓝ|ⓐ|ⓟ|ad\b|pn\b|~)", re.IGNORECASE)
+TOKEN_FIRST = frozenset("ⓥⓝⓐⓟⓋⓃⒶⓅaApP~")   # MEAN_TOK(IGNORECASE) 가 매치될 수 있는 첫 글자
+YEAR_EXAMS  = ("모고", "수능")
+
+def classify(line:str):
+    """라인 하나 → (label, text, year_match). 빈 라인은 (OTHER, '', None)"""
+    r = line.rstrip()
+    s = r.lstrip()
+    if not s:
+        return OTHER, s, None
+    c = s[0]
+    year = None
+    # 토큰 첫 글자가 아니면 MEAN_TOK/한글 검사를 건너뛰고, 연도 태그는 끝 5글자만 검사
+    if c in TOKEN_FIRST and MEAN_TOK.match(s) and HANGUL_RE.search(s):
+        label = MEANING
+    elif "A" <= c <= "Z" or "a" <= c <= "z":
+        label = EN
+        if s.endswith(YEAR_EXAMS):
+            year = YEAR_TAIL.search(s, max(len(s) - 5, 0))
+    elif HANGUL_RE.search(s):
+        label = KO
+    else:
+        label = OTHER
+    # 헤더 플래그는 들여쓰기 없는 라인에만 (기존 ^...$ 판정과 동일)
+    if r[0] == c:
+        if c.isdigit() and ID_RE.match(r):
+            label |= ID
+        elif c == "[" and PHON_RE.match(r):
+            label |= PHON
+    return label, s, year
+
+def classify_block(block:str):
+    """블록 → 비어 있지 않은 라인별 classify 결과 리스트"""
+    return [classify(ln) for ln in block.splitlines() if ln.strip()]
+
+def label_name(label:int)->str:
+    """디버깅용: 8|1 → 'EN|ID', 0 → 'OTHER'"""
+    return "|".join(n for f, n in LABEL_NAMES.items() if label & f) or "OTHER"
@@ -1,6 +1,156 @@
-def main():
-    print("Hello from dic!")
+# -*- coding: utf-8 -*-
+"""
+여러 단어장 일괄 변환 CLI (pdf2json2 파서 공용)
+- 입력: 파일 / 디렉터리(안의 *.txt) / glob 패턴 여러 개. 중복 경로는 한 번만
+- notebook_id: 파일 이름에서 유도 (pdf2json2.notebook_id_for — 확장자 제외, NFC·공백 정규화)
+  서로 다른 파일이 같은 notebook_id 가 되면 시작 전에 오류
+- 동시 처리
+  * 읽기: 스레드 풀에서 책별 mmap 블록 분리 (여러 책의 I/O 를 겹침)
+  * 파싱: 모든 책이 프로세스 풀 하나를 공유. 읽기가 끝난 책부터 블록을 batch_size 묶음으로 제출
+  * 쓰기: 책의 묶음 결과를 제출 순서대로 이어 붙여 스레드 풀에서 기록 → 책별 출력은 단독 실행과 바이트 동일
+- 출력 (OUT 디렉터리)
+  * <notebook_id>.json : 책별 결과 (--format html|compact|shared, --json 레이아웃)
+  * examples.json : --format shared 일 때 모든 책이 함께 쓰는 예문 표 (example_table.py — 책 사이 중복도 한 행)
+  * vocab_shared.css
+  * index.json : {"format": "vocab-index/1", "parser": PARSER_VERSION,
+                  "notebooks": [{"notebook_id", "file", "source", "blocks", "records", "skipped",
+                                 "chapters", "bytes", "sha256"}, ...],   (입력 순서)
+                  "examples": {"file", "count", "refs", "bytes", "sha256"}}    (shared 일 때만)
+  * assets/ : --assets 일 때 위 산출물의 내용 해시 이름 + .gz/.br/.zst 변형 + asset-manifest.json (asset_pack.py)
+- 사용: python main.py books/ "extra/*.txt" -o dist/ [-j 8] [--format compact] [--json ndjson] [--assets]
+        python main.py serve [dist/ | 빌드.json] [--host 0.0.0.0] [--port 8765]   (vocab_server.py — 로컬 HTTP 서버)
+"""
+import argparse, glob, hashlib, json, os, re, sys, time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import batched
+from pathlib import Path
 
+from asset_pack import MANIFEST, pack, report
+from example_table import ExampleTable
+from json_output import LAYOUTS, resolve_backend, write_records
+from pdf2json2 import (BATCH_SIZE, CSS, PARSER_VERSION, iter_blocks, notebook_id_for,
+                       parse_batch, parse_block, parse_fields)
+
+INDEX_FORMAT = "vocab-index/1"
+OUT_DIR = Path("./dist")
+UNSAFE = re.compile(r'[\\/:*?"<>|]')
+
+def expand_sources(patterns):
+    """파일/디렉터리/glob → 입력 파일 경로 리스트 (입력 순서, 디렉터리·glob 안은 이름순)"""
+    out = []
+    for p in patterns:
+        path = Path(p)
+        if path.is_dir():
+            out.extend(sorted(path.glob("*.txt")))
+        elif glob.has_magic(p):
+            out.extend(sorted(Path(g) for g in glob.glob(p, recursive=True) if Path(g).is_file()))
+        else:
+            out.append(path)
+    return list(dict.fromkeys(out))
+
+def read_blocks(path):
+    """스레드 풀용: 책 하나 → 블록 리스트"""
+    return list(iter_blocks(path))
+
+def write_book(records, path, layout, backend):
+    """스레드 풀용: 책 하나의 레코드 기록 → (챕터 수, 바이트, sha256)"""
+    write_records(records, path, layout, backend)
+    data = path.read_bytes()
+    return len({r["chapter_id"] for r in records}), len(data), hashlib.sha256(data).hexdigest()
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        from vocab_server import main as serve   # 서버 모듈은 serve 에서만 적재
+        return serve(argv[1:])
+    ap = argparse.ArgumentParser(description="여러 단어장 텍스트 → 책별 JSON + index.json 일괄 변환")
+    ap.add_argument("inputs", nargs="+", help="소스 .txt 파일, 디렉터리 또는 glob 패턴")
+    ap.add_argument("-o", "--out", default=OUT_DIR, type=Path, help="출력 디렉터리 (기본: %(default)s)")
+    ap.add_argument("-j", "--workers", default=os.cpu_count() or 1, type=int, help="파싱 프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--io-threads", default=4, type=int, help="읽기/쓰기 스레드 수 (기본: %(default)s)")
+    ap.add_argument("--batch-size", default=BATCH_SIZE, type=int, help="프로세스에 넘길 블록 묶음 크기 (기본: %(default)s)")
+    ap.add_argument("--format", choices=("html", "compact", "shared"), default="html",
+                    help="html: 카드 HTML 포함(기본) / compact: 구조화 필드만 / shared: compact + 책 공용 예문 표 참조")
+    ap.add_argument("--json", choices=LAYOUTS, help="출력 레이아웃 (기본: html 은 pretty, compact 포맷은 compact)")
+    ap.add_argument("--serializer", default="auto", choices=("auto", "json", "orjson"), help="JSON 직렬화 백엔드")
+    ap.add_argument("--assets", action="store_true",
+                    help="OUT/assets 에 해시 이름 + 미리 압축한 변형 + asset-manifest.json 생성 (이전 해시 파일은 삭제)")
+    args = ap.parse_args(argv)
+
+    sources = expand_sources(args.inputs)
+    missing = [s for s in sources if not s.is_file()]
+    if not sources or missing:
+        ap.error("입력 파일 없음: " + (", ".join(map(str, missing)) if missing else " ".join(args.inputs)))
+    notebooks = {}
+    for src in sources:
+        nb = notebook_id_for(src)
+        if nb in notebooks:
+            ap.error(f"notebook_id 중복 '{nb}': {notebooks[nb]} / {src}")
+        notebooks[nb] = src
+    files = {nb: UNSAFE.sub("_", nb) + ".json" for nb in notebooks}
+    if len(set(files.values())) != len(files):
+        ap.error("출력 파일 이름이 겹치는 notebook_id 가 있음")
+
+    compact = args.format in ("compact", "shared")
+    table = ExampleTable() if args.format == "shared" else None
+    layout = args.json or ("compact" if compact else "pretty")
+    backend = resolve_backend(args.serializer)
+    args.out.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+
+    books = {}   # src → (notebook_id, 블록 수, 묶음 future 리스트)
+    with ThreadPoolExecutor(args.io_threads) as io, ProcessPoolExecutor(args.workers) as pool:
+        reads = {io.submit(read_blocks, src): src for src in sources}
+        for fut in as_completed(reads):
+            src = reads[fut]
+            nb = notebook_id_for(src)
+            blocks = fut.result()
+            parse = partial(parse_fields if compact else parse_block, notebook_id=nb)
+            books[src] = (nb, len(blocks), [pool.submit(parse_batch, b, parse) for b in batched(blocks, args.batch_size)])
+
+        writes = []
+        for src in sources:
+            nb, n_blocks, futs = books[src]
+            records = [rec for f in futs for rec in f.result() if rec]
+            if table is not None:
+                records = [table.share(rec) for rec in records]   # 입력 순서대로 → 예문 표 순서가 실행마다 같음
+            out = args.out / files[nb]
+            writes.append((src, nb, n_blocks, len(records), out, io.submit(write_book, records, out, layout, backend)))
+
+        entries = []
+        for src, nb, n_blocks, n_records, out, fut in writes:
+            chapters, size, digest = fut.result()
+            entries.append({
+                "notebook_id": nb,
+                "file": out.name,
+                "source": src.as_posix(),
+                "blocks": n_blocks,
+                "records": n_records,
+                "skipped": n_blocks - n_records,
+                "chapters": chapters,
+                "bytes": size,
+                "sha256": digest,
+            })
+            print(f"  {nb}: {n_records:,}개 (건너뜀 {n_blocks - n_records}) → {out.as_posix()}")
+
+    (args.out / "vocab_shared.css").write_text(CSS, encoding="utf-8")
+    index = {"format": INDEX_FORMAT, "parser": PARSER_VERSION, "layout": layout, "content": args.format, "notebooks": entries}
+    if table is not None:
+        path = args.out / "examples.json"
+        table.write(path)
+        data = path.read_bytes()
+        index["examples"] = {"file": path.name, "count": len(table), "refs": table.refs,
+                             "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        print(f"{table.report()} → {path.as_posix()}")
+    (args.out / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    total = sum(e["records"] for e in entries)
+    print(f"{len(entries)}권 / {total:,}개 항목 → {(args.out / 'index.json').as_posix()} ({time.perf_counter() - t0:.2f}s)")
+    if args.assets:
+        t1 = time.perf_counter()
+        manifest, _ = pack([args.out], args.out / "assets", args.workers, prune=True)
+        print(f"{report(manifest)} → {(args.out / 'assets' / MANIFEST).as_posix()} ({time.perf_counter() - t1:.2f}s)")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
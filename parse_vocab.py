@@ -98,10 +98,11 @@ def save_to_json(vocab_list, output_file):
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(vocab_list, f, ensure_ascii=False, indent=2)
 
-# Parse the vocabulary file
-vocab_list = parse_vocabulary_file("사랑영단어 수능 2000.txt")
+if __name__ == '__main__':
+    # Parse the vocabulary file
+    vocab_list = parse_vocabulary_file("사랑영단어 수능 2000.txt")
 
-# Save to JSON
-save_to_json(vocab_list, "사랑영단어_수능_2000_parsed.json")
+    # Save to JSON
+    save_to_json(vocab_list, "사랑영단어_수능_2000_parsed.json")
 
-print("Parsed " + str(len(vocab_list)) + " vocabulary entries and saved to 사랑영단어_수능_2000_parsed.json")
\ No newline at end of file
+    print("Parsed " + str(len(vocab_list)) + " vocabulary entries and saved to 사랑영단어_수능_2000_parsed.json")
@@ -1,16 +1,16 @@
 # -*- coding: utf-8 -*-
 """
 사랑영단어 수능 2000 → 클래스 기반 HTML + 공통 CSS 생성기 (예문/번역 분리: 기존 로직 준용)
-- 입력: /mnt/data/사랑영단어 수능 2000.txt
-- 출력: /mnt/data/vocab_shared.css, /mnt/data/사랑영단어_수능_2000_class_based.json
+- 입력: ./사랑영단어 수능 2000.txt
+- 출력: ./vocab_shared.css, ./사랑영단어_수능_2000_class_based.json
 - chapter_id = ((id + 39) // 40)
 """
 import json, re, html
 from pathlib import Path
 
-SRC_TXT = Path("/mnt/data/사랑영단어 수능 2000.txt")
-OUT_CSS = Path("/mnt/data/vocab_shared.css")
-OUT_JSON = Path("/mnt/data/사랑영단어_수능_2000_class_based.json")
+SRC_TXT = Path("./사랑영단어 수능 2000.txt")
+OUT_CSS = Path("./vocab_shared.css")
+OUT_JSON = Path("./사랑영단어_수능_2000_class_based.json")
 
 CSS = """
 /* ----- Vocabulary Card Styles (Shared) ----- */
@@ -14,13 +14,58 @@
   * 연도 태그: EN 끝의 YY모고|수능 → <span class='year-tag'>YY모고</span>
   * chapter_id = ((id + 39) // 40) → 두 자리 문자열
   * html_content: 클래스 기반 카드(스타일 유지)
+- 처리: 소스를 mmap 으로 열어 블록 단위 generator → parse_block → JSON 배열 스트리밍 저장
+        (전체 텍스트/레코드 리스트를 메모리에 올리지 않으므로 입력 크기와 무관하게 메모리 일정)
+- 사용: python pdf2json2.py [입력.txt|입력.pdf] [-o 출력.json] [--css 출력.css] [--workers N]
+  * 입력이 .pdf 면 pdf_extract.py 로 페이지 병렬 추출한 블록을 바로 parse 로 스트리밍
+      --pages 1-120,200- : 페이지 범위, --page-cache PATH : 추출 페이지 캐시 (중단 후 재개),
+      --drop REGEX : 머리말/쪽 번호 라인 제거
+  * --workers N : 블록을 묶음 단위로 N개 프로세스에 분배 (출력은 직렬 실행과 바이트 동일)
+  * --cache PATH: 블록 해시(+PARSER_VERSION) 사이드카 캐시에 파싱 IR(구조화 레코드)을 저장.
+                  바뀐 블록만 재파싱하고 적중/미스 리포트. 카드 HTML 은 매번 IR 에서 렌더하므로
+                  템플릿(TEMPLATE_VERSION)만 바꾼 경우 재파싱 없이 다시 빌드됨
+  * --restyle   : --cache 의 IR 만으로 렌더 (원문을 읽지 않음 — 템플릿/CSS 수정 반복용)
+                  캐시가 다른 PARSER_VERSION/notebook_id 로 만들어졌으면 오류
+  * --sqlite PATH: PWA(db.ts) 스키마 그대로 채운 vocab.db 생성 (export_sqlite.py)
+  * --stats PATH : 예문 연도/시험 태그를 구조화 상태로 집계한 열 지향 JSON (vocab_stats.py, Stats 화면용)
+  * --format compact: html_content 대신 구조화 필드만 저장 (들여쓰기 없음)
+      {"id","notebook_id","chapter_id","headword","phonetic",
+       "meanings":[뜻...], "examples":[[en, ko|null, "YY"|null, "모고"|"수능"|null], ...]}
+    카드 HTML 은 공용 템플릿 render_card(rec) 로 html 모드와 바이트 동일하게 복원
+  * --format shared : compact 에서 예문을 공유 예문 표 id 참조로 바꿈 (example_table.py)
+      examples=[[예문 id, "YY"|null, 시험|null], ...] + <출력 이름>.examples.json (--examples 로 경로 지정)
+      중복 제거 비율을 리포트. 카드 HTML 은 ExampleTable.expand 후 render_card 로 동일하게 복원
+  * --compare-size : 출력 크기를 기준 포맷과 비교 (compact → html 모드, shared → compact). 기준 출력을 한 번 더
+                     직렬화하므로(compact 는 카드 렌더까지) 필요할 때만 켤 것
+  * --shard DIR : 챕터별 DIR/<chapter_id>.json + manifest.json(건수/바이트/sha256) 을 함께 생성
+                  → 클라이언트는 학습 중인 챕터만 받고, 해시가 바뀐 샤드만 다시 받으면 됨
+  * --json pretty|compact|ndjson : 출력 레이아웃, --serializer auto|json|orjson : 직렬화 백엔드
+                  (json_output.py — 레코드 단위 스트리밍, 백엔드와 무관하게 같은 바이트)
+  * --profile / --metrics out.json : split/parse/render/write 단계별 시간·호출 수, blocks/s,
+                  건너뛴 블록(사유별), 최대 RSS 출력/저장.  --cprofile out.prof : cProfile 덤프
 """
-import json, re, html
+import argparse, cProfile, hashlib, json, mmap, os, pstats, re, html, unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import batched, islice
 from pathlib import Path
 
+from block_cache import BlockCache
+from example_table import ExampleTable, examples_path, expand_records, find_table
+from line_classifier import EN, KINDS, KO, ID, MEANING, PHON, YEAR_TAIL, classify, classify_block
+from pipeline_metrics import Metrics
+from export_sqlite import export_db
+from json_output import FRAMES, LAYOUTS, iter_build, record_encoder, resolve_backend, write_records
+from vocab_stats import StatsBuilder
+
 SRC = Path("./사랑영단어 수능 2000.txt")
+NOTEBOOK_ID = "사랑영단어 수능 2000"
 OUT_JSON = Path("./사랑영단어_수능2000_styled_final.json")
 OUT_CSS  = Path("./vocab_shared.css")
+PARSER_VERSION = "pdf2json2/1"   # 파서/IR(parse_fields 결과) 변경 시 올릴 것 (캐시 무효화)
+TEMPLATE_VERSION = "card/1"      # 카드 HTML 템플릿/CSS 변경 시 올릴 것 (캐시는 유지, 렌더만 다시)
+BATCH_SIZE = 256   # --workers 모드에서 프로세스당 한 번에 넘기는 블록 수
 
 CSS = """
 /* ----- Vocabulary Card Styles (Shared) ----- */
@@ -56,138 +101,458 @@ CSS = """
 }
 """.strip()
 
-# Regex helpers
-ID_RE      = re.compile(r"^\d{4}$")
-PHON_RE    = re.compile(r"^\[.*?\]$")
-ENG_START  = re.compile(r"^[A-Za-z]")   # letter 시작
-HANGUL_RE  = re.compile(r"[\uac00-\ud7a3]")
-YEAR_TAIL  = re.compile(r"(?:\s|-)?(\d{2})(모고|수능)\s*$")
-MEAN_TOK   = re.compile(r"^\s*(ⓥ|ⓝ|ⓐ|ⓟ|ad\b|pn\b|~)", re.IGNORECASE)
-
-def is_english_start(s:str)->bool:
-    s = s.lstrip()
-    return bool(s and ENG_START.match(s))
-
-def has_hangul(s:str)->bool:
-    return bool(HANGUL_RE.search(s))
-
-def is_tokened_meaning(s:str)->bool:
-    """토큰이 있는 의미 라인인지 확인: ⓥ/ⓝ/ⓐ/ⓟ/ad/pn/~ 으로 시작하고 한글 포함"""
-    s_stripped = s.strip()
-    has_token = bool(MEAN_TOK.match(s_stripped))
-    has_korean = has_hangul(s_stripped)
-    return has_token and has_korean
-
+# 라인 분류(ID/PHON/MEANING/EN/KO + 연도 태그)는 line_classifier.py 에서 한 번에 수행
 def smart_join(prev:str, nxt:str)->str:
     if not prev: return nxt
     return prev + ("" if prev.endswith(("—","-","/","(")) or nxt.startswith((")",",",".",";","?","!","'","\"")) else " ") + nxt
 
-def highlight_year_tail(en_line:str)->str:
+def split_year_tail(en_line:str):
+    """EN 끝의 연도 태그 분리 → (본문, 'YY' | None, '모고'|'수능' | None)"""
     m = YEAR_TAIL.search(en_line)
     if not m:
-        return html.escape(en_line)
-    core = en_line[:m.start()].rstrip()
-    return html.escape(core) + f"<span class='year-tag'>{m.group(1)}{m.group(2)}</span>"
+        return en_line, None, None
+    return en_line[:m.start()].rstrip(), m.group(1), m.group(2)
+
+def split_merged_year(en_buf:str, last:str, m):
+    """병합된 EN 버퍼의 연도 태그 분리. m 은 마지막 라인(last)에서 분류기가 미리 구한 매치.
+    태그가 마지막 라인 맨 앞에 있으면 앞 줄과의 결합부('-' 등)가 매치에 포함될 수 있으므로 버퍼에서 재확인."""
+    if m is None:
+        return en_buf, None, None
+    if m.start() == 0 and len(en_buf) != len(last):
+        return split_year_tail(en_buf)
+    return en_buf[:len(en_buf) - len(last) + m.start()].rstrip(), m.group(1), m.group(2)
+
+# 카드 HTML 템플릿 (html / compact 모드 공용 — 값은 모두 esc 후 삽입). 바꾸면 TEMPLATE_VERSION 올릴 것
+CARD_TMPL = (
+    "<section class='voc'>"
+    "  <article class='card'>"
+    "    <header class='head'><div class='hw'>{headword}</div>{phon}<div class='meta'>#{id}</div></header>"
+    "    <div class='defs'>{defs}</div>"
+    "    <div class='examples'>{examples}</div>"
+    "  </article>"
+    "</section>"
+)
+PHON_TMPL = "<div class='phon'>{}</div>"
+MEAN_TMPL = "<span class='mean'>{}</span><br/>"
+EX_TMPL   = "<div class='ex'><div class='en'>{en}{year}</div>{ko}</div>"
+YEAR_TMPL = "<span class='year-tag'>{}{}</span>"
+KO_TMPL   = "<div class='ko'>{}</div>"
+
+ESC_RE = re.compile(r"[&<>\"']")
+
+def esc(s:str)->str:
+    """html.escape 와 같은 결과. 이스케이프할 문자가 없는 대부분의 값은 그대로 반환"""
+    return html.escape(s) if ESC_RE.search(s) else s
+
+def render_card(rec)->str:
+    """구조화 레코드(meanings, examples=[[en, ko, year, exam], ...]) → 카드 HTML"""
+    examples = "".join(
+        EX_TMPL.format(
+            en=esc(en),
+            year=YEAR_TMPL.format(year, exam) if year else "",
+            ko=KO_TMPL.format(esc(ko)) if ko else "",
+        )
+        for en, ko, year, exam in rec["examples"]
+    )
+    return CARD_TMPL.format(
+        headword=esc(rec["headword"]),
+        phon=PHON_TMPL.format(esc(rec["phonetic"])) if rec["phonetic"] else "",
+        id=rec["id"],
+        defs="".join(MEAN_TMPL.format(esc(m)) for m in rec["meanings"]),
+        examples=examples,
+    )
+
+def to_html_record(rec):
+    """구조화 레코드 → 기존 출력 레코드 (html_content 포함)"""
+    return {
+        "id": rec["id"],
+        "notebook_id": rec["notebook_id"],
+        "chapter_id": rec["chapter_id"],
+        "headword": rec["headword"],
+        "phonetic": rec["phonetic"],
+        "html_content": render_card(rec),
+    }
 
 def split_blocks(text:str):
     return [b.strip() for b in re.split(r"^\s*---\s*$", text, flags=re.M) if b.strip()]
 
-def parse_block(block:str):
-    lines = [ln.rstrip() for ln in block.splitlines() if ln.strip()]
+# '---' 구분 라인 (mmap 바이트 스캔용)
+SEP_RE = re.compile(rb"^[ \t\r\f\v]*---[ \t\r\f\v]*$", re.M)
+
+def iter_blocks(path):
+    """소스 파일을 mmap 으로 열어 '---' 블록을 하나씩 yield (전체 read_text 없이 스트리밍)"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            for m in SEP_RE.finditer(mm):
+                b = mm[start:m.start()].decode("utf-8").strip()
+                if b: yield b
+                start = m.end()
+            b = mm[start:].decode("utf-8").strip()
+            if b: yield b
+
+def parse_batch(batch, parse=None):
+    """워커 프로세스용: 블록 묶음 → 블록별 parse 결과 (순서 유지, 실패 블록은 None)"""
+    return [(parse or parse_block)(b) for b in batch]
+
+def iter_parsed(blocks, workers=1, batch_size=BATCH_SIZE, parse=None):
+    """블록 스트림 → 블록별 parse(기본 parse_block) 결과 스트림 (실패 블록은 None 으로 자리 유지).
+    workers>1 이면 블록을 batch_size 단위로 묶어 프로세스 풀에 분배한다.
+    제출 순서대로 결과를 꺼내므로 출력 순서는 직렬 실행과 동일하고,
+    진행 중인 묶음 수를 workers*2 로 제한해 메모리도 일정하게 유지."""
+    if workers <= 1:
+        yield from map(parse or parse_block, blocks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        pending = deque()
+        for batch in batched(blocks, batch_size):
+            pending.append(ex.submit(parse_batch, batch, parse))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def iter_records(blocks, workers=1, batch_size=BATCH_SIZE, parse=None):
+    """블록 스트림 → 레코드 스트림 (파싱 실패 블록은 건너뜀)"""
+    return (rec for rec in iter_parsed(blocks, workers, batch_size, parse) if rec)
+
+def iter_records_cached(blocks, cache, workers=1, batch_size=BATCH_SIZE, parse=None):
+    """증분 빌드: 해시가 바뀐 블록만 재파싱해 캐시에 반영한 뒤, 캐시에서 순서대로 레코드(IR)를 꺼낸다.
+    (1) 블록 한 번 스캔 → 해시 비교는 메모리에서, 미스 블록만 parse (직렬/병렬) → 순번과 함께 저장
+    (2) 이번에 보이지 않은 블록 삭제 → ORDER BY 순번 커서로 레코드 yield (블록별 SELECT 없음)"""
+    keys = deque()
+    def misses():
+        for pos, (key, b) in enumerate(cache.keyed(blocks)):
+            if cache.lookup(key, b, pos) is None:
+                keys.append((key, b, pos))
+                yield b
+    for rec in iter_parsed(misses(), workers, batch_size, parse):
+        key, b, pos = keys.popleft()
+        cache.store(key, b, rec, pos)
+    cache.commit()
+    cache.prune()
+    yield from cache.records()
+
+class ShardWriter:
+    """챕터별 샤드 파일 + manifest.json 기록기.
+    레코드를 받는 즉시 해당 챕터 파일에 이어 쓰고(현재 챕터 파일만 열어 둠),
+    close() 에서 배열을 닫고 건수/바이트/sha256 을 manifest 에 기록한다."""
+    def __init__(self, out_dir, layout="pretty", backend="auto", fmt="html"):
+        self.dir = Path(out_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.layout, self.fmt = layout, fmt
+        self.ext = "ndjson" if layout == "ndjson" else "json"
+        self.encode = record_encoder(layout, backend)
+        self.first, self.sep, self.end, self.empty = FRAMES[layout]
+        self.shards = {}      # chapter_id → 기록한 레코드 수 (삽입 순서 = 첫 등장 순서)
+        self.notebook = None
+        self._cur, self._f = None, None
+
+    def _tmp(self, chapter_id):
+        return self.dir / f"{chapter_id}.{self.ext}.tmp"
+
+    def add(self, rec):
+        ch = rec["chapter_id"]
+        self.notebook = self.notebook or rec["notebook_id"]
+        if ch != self._cur:
+            if self._f: self._f.close()
+            self._f = open(self._tmp(ch), "ab" if ch in self.shards else "wb")
+            self._cur = ch
+        n = self.shards.get(ch, 0)
+        self._f.write((self.sep if n else self.first) + self.encode(rec))
+        self.shards[ch] = n + 1
+
+    def tee(self, records):
+        for rec in records:
+            self.add(rec)
+            yield rec
+
+    def close(self, examples=None):
+        """examples: shared 포맷의 ExampleTable — 샤드 디렉터리에 examples.json 으로 함께 기록"""
+        if self._f: self._f.close()
+        entries = []
+        for ch, count in self.shards.items():
+            tmp, path = self._tmp(ch), self.dir / f"{ch}.{self.ext}"
+            with open(tmp, "ab") as f:
+                f.write(self.end)
+            os.replace(tmp, path)
+            data = path.read_bytes()
+            entries.append({"chapter_id": ch, "file": path.name, "count": count,
+                            "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+        manifest = {"notebook_id": self.notebook, "format": self.fmt, "layout": self.layout,
+                    "template": TEMPLATE_VERSION if self.fmt == "html" else None,
+                    "count": sum(self.shards.values()), "chapters": entries}
+        if examples is not None:
+            path = self.dir / "examples.json"
+            examples.write(path)
+            data = path.read_bytes()
+            manifest["examples"] = {"file": path.name, "count": len(examples), "bytes": len(data),
+                                    "sha256": hashlib.sha256(data).hexdigest()}
+        (self.dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        return manifest
+
+def skip_reason(block:str):
+    """parse_labeled 가 None 을 돌려줄 블록의 사유 (헤더 최대 3줄만 분류). 정상 블록이면 None.
+    parse_labeled 의 헤더 판정과 같게 유지할 것"""
+    lines = [classify(ln) for ln in islice((ln for ln in block.splitlines() if ln.strip()), 3)]
+    if len(lines) < 2: return "too_few_lines"
+    if not lines[0][0] & ID: return "bad_id"
+    idx = 2 if lines[1][0] & PHON else 1
+    if idx >= len(lines): return "no_headword"
+    return None
+
+def iter_checked(blocks, metrics):
+    """계측용: 블록 수와 건너뛸 블록의 사유를 집계하며 그대로 통과"""
+    for b in blocks:
+        metrics.count("blocks")
+        if (reason := skip_reason(b)):
+            metrics.skip(reason)
+        yield b
+
+def notebook_id_for(path)->str:
+    """소스 파일 이름 → notebook_id ('사랑영단어 수능 2000.txt' → '사랑영단어 수능 2000')"""
+    return " ".join(unicodedata.normalize("NFC", Path(path).stem).split())
+
+def parse_labeled(lines, notebook_id=NOTEBOOK_ID):
+    """classify_block 결과 → 구조화 레코드 (라벨 기반 상태기계). 실패 시 None"""
     if len(lines) < 2: return None
-    if not ID_RE.match(lines[0]): return None
-    word_id = int(lines[0])
+    if not lines[0][0] & ID: return None
+    word_id = int(lines[0][1])
 
     idx, phon = 1, ""
-    if idx < len(lines) and PHON_RE.match(lines[idx]):
-        phon = lines[idx].strip(); idx += 1
+    if idx < len(lines) and lines[idx][0] & PHON:
+        phon = lines[idx][1]; idx += 1
 
     if idx >= len(lines): return None
-    headword = lines[idx].strip(); idx += 1
+    headword = lines[idx][1]; idx += 1
     content = lines[idx:]
+    n = len(content)
 
-    # 1) 뜻: 첫 영어 라인 이전에서 최대 3줄
+    # 1) 뜻: 첫 EN 라인 이전에서 최대 3줄 (토큰 의미 라인 또는 한글 라인)
     meanings, i = [], 0
-    while i < len(content) and len(meanings) < 3:
-        s = content[i]
-        
-        # 영어로 시작하지만 토큰이 있는 의미라면 의미로 처리
-        if is_tokened_meaning(s):
-            meanings.append(s.strip())
-            i += 1
-            continue
-            
-        # 일반 영어 라인이면 의미 추출 종료
-        if is_english_start(s): 
-            break
-            
-        # 한글 포함 라인이면 의미로 처리
-        if has_hangul(s):
-            meanings.append(s.strip())
-            i += 1
-        else:
-            break
+    while i < n and len(meanings) < 3 and content[i][0] & (MEANING | KO):
+        meanings.append(content[i][1]); i += 1
 
-    # 2) 예문/번역
+    # 2) 예문/번역: EN 라인에서 시작, 연속 EN 병합 → 연속 KO 병합 (그 외 라인은 건너뜀)
     examples = []
-    while i < len(content):
-        # 토큰이 있는 의미 라인은 건너뛰기 (이미 의미에서 처리됨)
-        if is_tokened_meaning(content[i]):
+    while i < n:
+        if content[i][0] & KINDS != EN:
             i += 1
             continue
-            
-        # 영어로 시작하지 않으면 건너뛰기
-        if not is_english_start(content[i]): 
-            i += 1
-            continue
-            
+
         # EN merge
-        en_buf = content[i].strip(); i += 1
-        while i < len(content) and is_english_start(content[i]) and not is_tokened_meaning(content[i]):
-            en_buf = smart_join(en_buf, content[i].strip()); i += 1
-            
+        _, en_buf, year = content[i]; last = en_buf; i += 1
+        while i < n and content[i][0] & KINDS == EN:
+            _, last, year = content[i]
+            en_buf = smart_join(en_buf, last); i += 1
+
         # KO merge
         ko_buf = ""
-        while i < len(content) and has_hangul(content[i]) and not is_english_start(content[i]) and not is_tokened_meaning(content[i]):
-            ko_buf = smart_join(ko_buf, content[i].strip()); i += 1
-            
-        examples.append((en_buf, ko_buf or None))
-
-    # HTML build (class-based)
-    defs_html = "".join(f"<span class='mean'>{html.escape(m)}</span><br/>" for m in meanings)
-    ex_html_parts = []
-    for en, ko in examples:
-        en_html = highlight_year_tail(en)
-        blk = f"<div class='ex'><div class='en'>{en_html}</div>"
-        if ko: blk += f"<div class='ko'>{html.escape(ko)}</div>"
-        blk += "</div>"
-        ex_html_parts.append(blk)
-    phon_html = f"<div class='phon'>{html.escape(phon)}</div>" if phon else ""
-    html_content = (
-        "<section class='voc'>"
-        "  <article class='card'>"
-        f"    <header class='head'><div class='hw'>{html.escape(headword)}</div>{phon_html}<div class='meta'>#{str(word_id).zfill(4)}</div></header>"
-        f"    <div class='defs'>{defs_html}</div>"
-        f"    <div class='examples'>{''.join(ex_html_parts)}</div>"
-        "  </article>"
-        "</section>"
-    )
+        while i < n and content[i][0] & KINDS == KO:
+            ko_buf = smart_join(ko_buf, content[i][1]); i += 1
+
+        en, year, exam = split_merged_year(en_buf, last, year)
+        examples.append([en, ko_buf or None, year, exam])
+
     return {
         "id": f"{word_id:04d}",
-        "notebook_id": "사랑영단어 수능 2000",
+        "notebook_id": notebook_id,
         "chapter_id": f"{((word_id + 39)//40):02d}",
         "headword": headword,
         "phonetic": phon,
-        "html_content": html_content
+        "meanings": meanings,
+        "examples": examples,
     }
 
-# 실행
-raw = Path(SRC).read_text(encoding="utf-8")
-blocks = split_blocks(raw)
-items = [rec for b in blocks if (rec := parse_block(b))]
+def parse_fields(block:str, notebook_id=NOTEBOOK_ID):
+    """블록 → 구조화 레코드 (html 미생성). 실패 시 None"""
+    return parse_labeled(classify_block(block), notebook_id)
+
+def parse_block(block:str, notebook_id=NOTEBOOK_ID):
+    """블록 → 기존 출력 레코드 (html_content 포함). 실패 시 None"""
+    rec = parse_fields(block, notebook_id)
+    return rec and to_html_record(rec)
+
+def iter_structured(path, workers=1):
+    """원문 텍스트(.txt) 또는 compact/shared 빌드(.json/.ndjson) → 구조화 레코드 스트림 (색인/집계 단계 공용 입력)
+    shared 빌드는 옆의 예문 표(<이름>.examples.json 또는 main.py 의 examples.json)로 예문을 펼친다."""
+    path = Path(path)
+    if path.suffix == ".txt":
+        yield from iter_records(iter_blocks(path), workers, parse=partial(parse_fields, notebook_id=notebook_id_for(path)))
+        return
+    records = iter_build(path)   # 배열/NDJSON 모두 레코드 단위로 읽음 (main.py 의 .json 확장자 NDJSON 도)
+    table = ExampleTable.load(found) if (found := find_table(path)) else None
+    for rec in expand_records(records, table, path):
+        if "meanings" not in rec:
+            raise ValueError(f"{path}: 구조화 필드가 없음 — --format compact 빌드나 원문 텍스트를 사용할 것")
+        yield rec
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="사랑영단어 텍스트 → 스타일 카드 JSON")
+    ap.add_argument("src", nargs="?", default=SRC, type=Path, help="입력 텍스트 (기본: %(default)s)")
+    ap.add_argument("-o", "--out", default=OUT_JSON, type=Path, help="출력 JSON (기본: %(default)s)")
+    ap.add_argument("--pages", help="PDF 입력의 페이지 범위 (1부터, 예: 1-120,200-)")
+    ap.add_argument("--page-cache", type=Path, help="PDF 추출 페이지 캐시 (중단 후 재개용 SQLite)")
+    ap.add_argument("--drop", type=re.compile, help="PDF 입력에서 제거할 라인 정규식 (머리말/쪽 번호 등)")
+    ap.add_argument("--notebook-id", help="레코드의 notebook_id (기본: 입력 파일 이름)")
+    ap.add_argument("--css", default=OUT_CSS, type=Path, help="출력 CSS (기본: %(default)s)")
+    ap.add_argument("-j", "--workers", default=1, type=int, help="파싱 프로세스 수 (기본: 1 = 직렬)")
+    ap.add_argument("--batch-size", default=BATCH_SIZE, type=int, help="워커당 블록 묶음 크기 (기본: %(default)s)")
+    ap.add_argument("--format", choices=("html", "compact", "shared"), default="html",
+                    help="html: 카드 HTML 포함(기본) / compact: 구조화 필드만, 들여쓰기 없음 (render_card 로 동일 HTML 복원)"
+                         " / shared: compact + 예문은 공유 예문 표 id 참조")
+    ap.add_argument("--examples", type=Path, help="--format shared 의 예문 표 경로 (기본: <출력 이름>.examples.json)")
+    ap.add_argument("--compare-size", action="store_true",
+                    help="compact 는 html 모드(pretty), shared 는 같은 레이아웃의 compact 출력과 크기 비교 (기준 출력을 한 번 더 직렬화)")
+    ap.add_argument("--json", choices=LAYOUTS, help="출력 레이아웃 pretty(indent=2 배열) / compact / ndjson "
+                                                   "(기본: html 은 pretty, compact 포맷은 compact)")
+    ap.add_argument("--serializer", default="auto", choices=("auto", "json", "orjson"),
+                    help="JSON 직렬화 백엔드 (auto: orjson 이 있으면 사용, 없으면 표준 json)")
+    ap.add_argument("--shard", type=Path, help="챕터별 샤드 + manifest.json 도 함께 생성할 디렉터리")
+    ap.add_argument("--sqlite", type=Path, help="PWA 스키마 SQLite 도 함께 생성 (예: vocab.db)")
+    ap.add_argument("--cache", type=Path, help="증분 빌드 캐시 — 파싱 IR 저장 (SQLite 사이드카, 예: vocab.cache.db)")
+    ap.add_argument("--restyle", action="store_true", help="원문을 읽지 않고 --cache 의 IR 만 다시 렌더 (템플릿 수정용)")
+    ap.add_argument("--stats", type=Path, help="출제 연도/시험 집계표(열 지향 JSON)도 함께 생성 (예: vocab_stats.json)")
+    ap.add_argument("--profile", action="store_true", help="단계별 시간/호출 수, 처리량, 건너뛴 블록, 최대 RSS 출력")
+    ap.add_argument("--metrics", type=Path, help="--profile 계측 결과를 JSON 으로 저장")
+    ap.add_argument("--cprofile", type=Path, help="cProfile 통계 덤프 파일 (예: pdf2json2.prof)")
+    args = ap.parse_args(argv)
+    if args.restyle and not (args.cache and args.cache.is_file()):
+        ap.error("--restyle 에는 기존 --cache 파일이 필요함")
+
+    compact = args.format in ("compact", "shared")
+    layout = args.json or ("compact" if compact else "pretty")
+    backend = resolve_backend(args.serializer)
+    metrics = Metrics() if args.profile or args.metrics else None
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+
+    # 실행: mmap 블록 스트림 → parse (직렬/병렬, 캐시) → JSON 배열 스트리밍 저장
+    # 계측 시 직렬 html 모드는 parse_fields / render(to_html_record) 를 나눠 잰다 (병렬이면 워커 안에서 함께 처리)
+    # --stats 면 html 모드도 구조화 레코드로 파싱해 집계한 뒤 렌더 (출력은 parse_block 과 바이트 동일)
+    # --cache 는 항상 IR 을 저장하고 렌더는 캐시 뒤에서 수행 → 캐시 키에 포맷/템플릿이 들어가지 않음
+    split_render = bool(metrics) and args.workers <= 1 and not compact
+    structured = compact or split_render or bool(args.stats) or bool(args.cache)
+    notebook_id = args.notebook_id or notebook_id_for(args.src)
+    parse = partial(parse_fields if structured else parse_block, notebook_id=notebook_id)
+    page_cache = None
+    if args.restyle:
+        blocks = None
+    elif args.src.suffix.lower() == ".pdf":
+        from pdf_extract import PageCache, iter_pdf_blocks, page_count, parse_pages   # pypdf 는 PDF 입력에서만 필요
+        try:
+            pages = parse_pages(args.pages, page_count(args.src))
+        except ValueError as e:
+            ap.error(str(e))
+        page_cache = PageCache(args.page_cache, args.src, args.drop) if args.page_cache else None
+        blocks = iter_pdf_blocks(args.src, pages, args.workers, page_cache, args.drop)
+    else:
+        blocks = iter_blocks(args.src)
+    if args.cache:
+        cache = BlockCache(args.cache, f"{PARSER_VERSION}/{notebook_id}")
+        if args.restyle:
+            if cache.stored_version != cache.version:
+                cache.close()
+                ap.error(f"--restyle: 캐시가 현재 파서/단어장과 다름 (캐시 '{cache.stored_version}', 현재 '{cache.version}')"
+                         " — 원문으로 --cache 빌드를 먼저 실행할 것")
+            records = cache.records()
+        else:
+            records = iter_records_cached(blocks, cache, args.workers, args.batch_size, parse)
+    else:
+        cache = None
+        if metrics:
+            blocks = iter_checked(metrics.timed_iter("split", blocks), metrics)
+        records = iter_records(blocks, args.workers, args.batch_size, parse)
+    if metrics:
+        records = metrics.timed_iter("parse", records)
+    stats = StatsBuilder() if args.stats else None
+    if stats:
+        records = stats.tee(records)
+        if metrics:
+            records = metrics.timed_iter("stats", records)
+    if structured and not compact:
+        if cache and args.workers > 1:
+            # 캐시 경로는 파싱이 끝난 뒤 렌더하므로 같은 프로세스 수로 렌더를 분배
+            records = iter_parsed(records, args.workers, args.batch_size, to_html_record)
+        else:
+            records = map(to_html_record, records)
+        if metrics:
+            records = metrics.timed_iter("render", records)
+    baseline = None
+    if compact and args.compare_size:
+        # 비교 기준: compact → html 모드(pretty, 카드 렌더 포함), shared → 예문 표 적용 전 compact (같은 레이아웃)
+        base_layout = layout if args.format == "shared" else "pretty"
+        encode = record_encoder(base_layout, backend)
+        as_base = (lambda rec: rec) if args.format == "shared" else to_html_record
+        baseline = [0, 0]   # 기준 포맷이었다면 나왔을 레코드 바이트 수, 레코드 수
+        def measured(records):
+            for rec in records:
+                baseline[0] += len(encode(as_base(rec)))
+                baseline[1] += 1
+                yield rec
+        records = measured(records)
+        if metrics:
+            records = metrics.timed_iter("compare_size", records)
+    table = ExampleTable() if args.format == "shared" else None
+    if table is not None:
+        records = table.tee(records)
+        if metrics:
+            records = metrics.timed_iter("share", records)
+    shards = ShardWriter(args.shard, layout, backend, args.format) if args.shard else None
+    if shards:
+        records = shards.tee(records)
+    write = metrics.timed("write", write_records) if metrics else write_records
+    n = write(records, args.out, layout, backend)
+    if shards:
+        manifest = shards.close(table)
+        print(f"샤드 {len(manifest['chapters'])}개 → {args.shard.as_posix()}/manifest.json")
+    if cache:
+        cache.close()
+        print(cache.report())
+    if page_cache:
+        page_cache.close()
+        print(page_cache.report())
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    if metrics:
+        metrics.count("records", n)
+        metrics.notes.update(format=args.format, layout=layout, serializer=backend, workers=args.workers,
+                             parse_includes_render=not structured, template=TEMPLATE_VERSION, restyle=args.restyle)
+        if cache:
+            metrics.notes.update(cache_hits=cache.hits, cache_misses=cache.misses)
+        print(metrics.format())
+        if args.metrics:
+            metrics.dump(args.metrics)
 
-# 저장
-OUT_CSS.write_text(CSS, encoding="utf-8")
-OUT_JSON.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+    # 저장
+    args.css.write_text(CSS, encoding="utf-8")
+    print(f"{n}개 항목 → {args.out.as_posix()}, CSS → {args.css.as_posix()}")
+    if table is not None:
+        table_path = args.examples or examples_path(args.out)
+        table.write(table_path)
+        print(f"{table.report()} → {table_path.as_posix()}")
+    if baseline:
+        first, sep, end, empty = FRAMES[base_layout]
+        before = baseline[0] + (len(first) + len(sep) * (baseline[1] - 1) + len(end) if baseline[1] else len(empty))
+        after = args.out.stat().st_size + (table_path.stat().st_size if table is not None else 0)
+        label = "compact 포맷" if args.format == "shared" else "html 모드"
+        change = f"{1 - after / before:.1%} 감소" if after <= before else f"{after / before - 1:.1%} 증가"
+        print(f"{args.format}: {after:,} bytes ({label} {before:,} bytes 대비 {change})")
+    if stats:
+        stats.write(args.stats)
+        print(f"집계표 → {args.stats.as_posix()} ({args.stats.stat().st_size:,} bytes)")
+    if args.sqlite:
+        records = iter_build(args.out)
+        if table is not None:
+            records = map(table.expand, records)
+        nb, ch, nw = export_db(map(to_html_record, records) if compact else records, args.sqlite)
+        print(f"SQLite → {args.sqlite.as_posix()} (notebooks {nb} / chapters {ch} / words {nw})")
+    return n
 
-len(items), OUT_JSON.as_posix(), OUT_CSS.as_posix()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+PDF → '---' 블록 추출 단계 (수동 PDF→txt 변환 대체)
+- 페이지 지연 로딩: PdfReader 는 xref 만 읽고, 페이지는 요청된 번호만 열어 텍스트 추출
+- 페이지 병렬: 페이지 번호를 묶음 단위로 프로세스 풀에 분배 (pdf2json2.iter_parsed 재사용 — 순서 유지)
+  워커마다 PdfReader 를 한 번만 열어 둠. 정규화도 워커에서 수행
+- 라인 정규화 (normalize_page)
+  * NFC, 합자(ﬁ 등)/nbsp/폭 없는 공백 정리, 줄 끝 soft hyphen 은 다음 줄과 붙임
+  * 대시 3개 이상만 있는 라인('—––', '- - -' 등) → '---'
+  * 연도 태그('06모고')만 따로 떨어진 라인은 앞 영어 라인 끝에 붙임 (오른쪽 정렬 태그가 줄바꿈되는 경우)
+  * --drop 정규식에 맞는 라인(머리말/쪽 번호 등) 제거
+- 블록 조립: 페이지 텍스트를 이어 붙여 '---' 마다 블록 yield → 페이지를 넘는 블록도 그대로 이어짐
+  (다음 쪽 첫 줄로 넘어간 연도 태그도 여기서 앞 라인에 붙임)
+  페이지 범위의 시작/끝·범위 사이 빈틈에 걸친 잘린 블록은 버림
+- 재개: --page-cache PATH (SQLite) 에 추출한 페이지 텍스트를 묶음마다 커밋
+  중간에 실패/중단되어도 다시 실행하면 남은 페이지만 추출. PDF 크기/수정 시각이나 EXTRACT_VERSION 이 바뀌면 비움
+- 사용: python pdf_extract.py 책.pdf [-o 책.txt] [--pages 1-120,200-] [-j 4] [--page-cache 책.pages.db]
+        python pdf2json2.py 책.pdf [--pages ...] [--page-cache ...]   (블록을 바로 parse 로 스트리밍)
+- pypdf 필요 (pip install .[pdf])
+"""
+import argparse, os, re, sqlite3, sys, time, unicodedata
+from functools import partial
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from line_classifier import YEAR_TAIL
+
+EXTRACT_VERSION = "pdf_extract/1"   # normalize_page 변경 시 올릴 것 (페이지 캐시 무효화)
+PAGE_BATCH = 4                      # 워커당 한 번에 넘기는 페이지 수
+SEP = "---"
+
+CLEAN = str.maketrans({"ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl",
+                       "\u00a0": " ", "\u3000": " ", "\u200b": None, "\ufeff": None})
+SOFT_HYPHEN = "\u00ad"
+SEP_LINE = re.compile(r"^\s*(?:[-‐‑‒–—―─]\s*){3,}$")
+YEAR_ONLY = re.compile(r"^\s*\d{2}(?:모고|수능)\s*$")
+
+_readers = {}   # 프로세스별 열린 PdfReader (워커가 페이지마다 다시 열지 않도록)
+
+def reader_for(path)->PdfReader:
+    key = os.fspath(path)
+    if key not in _readers:
+        _readers[key] = PdfReader(key)
+    return _readers[key]
+
+def page_count(path)->int:
+    return len(reader_for(path).pages)
+
+def parse_pages(spec, n_pages:int):
+    """'1-10,15,30-' (1부터, 양끝 포함) → 0부터 시작하는 페이지 번호 리스트 (정렬, 중복 제거). None 이면 전체"""
+    if not spec:
+        return list(range(n_pages))
+    pages = set()
+    for part in spec.split(","):
+        lo, dash, hi = part.strip().partition("-")
+        try:
+            start = int(lo) if lo else 1
+            end = (int(hi) if hi else n_pages) if dash else start
+        except ValueError:
+            raise ValueError(f"페이지 범위 형식 오류: '{part}'") from None
+        if start < 1 or end < start:
+            raise ValueError(f"페이지 범위 오류: '{part}'")
+        pages.update(range(start - 1, min(end, n_pages)))
+    return sorted(pages)
+
+def attach_year(lines, ln:str)->bool:
+    """ln 이 연도 태그만 있는 라인이고 앞 라인이 태그 없는 영어 라인이면 그 끝에 붙임"""
+    if not (lines and YEAR_ONLY.match(ln)):
+        return False
+    prev = lines[-1]
+    if not (prev[:1].isascii() and prev[:1].isalpha()) or YEAR_TAIL.search(prev):
+        return False
+    lines[-1] = f"{prev} {ln.strip()}"
+    return True
+
+def normalize_page(text:str, drop=None)->str:
+    """추출한 페이지 텍스트 → 정규화한 라인들 ('\\n' 로 연결, 빈 라인 제거)"""
+    out = []
+    carry = ""
+    for ln in unicodedata.normalize("NFC", text).translate(CLEAN).splitlines():
+        ln = carry + ln.rstrip()
+        carry = ""
+        if ln.endswith(SOFT_HYPHEN):
+            carry = ln[:-1]
+            continue
+        ln = ln.replace(SOFT_HYPHEN, "")
+        if not ln.strip() or (drop and drop.search(ln)):
+            continue
+        if SEP_LINE.match(ln):
+            out.append(SEP)
+        elif not attach_year(out, ln):
+            out.append(ln)
+    if carry:
+        out.append(carry)
+    return "\n".join(out)
+
+def extract_page(page:int, path, drop=None)->str:
+    """워커용: 페이지 번호(0부터) → 정규화한 텍스트"""
+    try:
+        text = reader_for(path).pages[page].extract_text() or ""
+    except Exception as e:
+        raise RuntimeError(f"{path}: {page + 1}쪽 추출 실패: {e}") from e
+    return normalize_page(text, drop)
+
+class PageCache:
+    """추출한 페이지 텍스트 사이드카 (재개용). 묶음마다 commit 하므로 중단 시점까지의 페이지가 남음"""
+    def __init__(self, path, pdf_path, drop=None):
+        st = os.stat(pdf_path)
+        self.source = f"{EXTRACT_VERSION}\0{st.st_size}\0{st.st_mtime_ns}\0{drop.pattern if drop else ''}"
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS pages(page INTEGER PRIMARY KEY, text TEXT NOT NULL);
+        """)
+        row = self.db.execute("SELECT value FROM meta WHERE key='source'").fetchone()
+        if not row or row[0] != self.source:
+            self.db.execute("DELETE FROM pages")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (self.source,))
+            self.db.commit()
+        self.done = {p for (p,) in self.db.execute("SELECT page FROM pages")}
+        self.hits = self.extracted = 0
+
+    def text(self, page:int)->str:
+        return self.db.execute("SELECT text FROM pages WHERE page=?", (page,)).fetchone()[0]
+
+    def store(self, page:int, text:str):
+        self.db.execute("INSERT OR REPLACE INTO pages VALUES (?,?)", (page, text))
+        self.done.add(page)
+        self.extracted += 1
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def report(self)->str:
+        return f"페이지 캐시 {self.path.as_posix()}: 재사용 {self.hits} / 추출 {self.extracted}"
+
+def iter_page_texts(path, pages, workers=1, cache=None, drop=None):
+    """페이지 번호 리스트 → (페이지 번호, 정규화 텍스트) 스트림 (순서 유지).
+    캐시가 있으면 빠진 페이지만 추출 풀에 넣고, 캐시 페이지와 순서대로 섞어 내보내며 PAGE_BATCH 마다 커밋."""
+    from pdf2json2 import iter_parsed   # pdf2json2 가 .pdf 입력에서 이 모듈을 import 하므로 지연 import
+    extract = partial(extract_page, path=path, drop=drop)
+    if cache is None:
+        yield from zip(pages, iter_parsed(pages, workers, PAGE_BATCH, extract))
+        return
+    extracted = iter_parsed([p for p in pages if p not in cache.done], workers, PAGE_BATCH, extract)
+    for page in pages:
+        if page in cache.done:
+            cache.hits += 1
+            yield page, cache.text(page)
+            continue
+        text = next(extracted)
+        cache.store(page, text)
+        if cache.extracted % PAGE_BATCH == 0:
+            cache.commit()
+        yield page, text
+    cache.commit()
+
+def iter_pdf_blocks(path, pages=None, workers=1, cache=None, drop=None):
+    """PDF → '---' 블록 스트림 (pdf2json2.iter_blocks 와 같은 형태: 블록별 strip 된 텍스트).
+    pages: parse_pages 결과 (None 이면 전체). 범위 가장자리/빈틈에서 잘린 블록은 버림."""
+    n_pages = page_count(path)
+    pages = list(range(n_pages)) if pages is None else pages
+    if not pages:
+        return
+    buf, prev = [], None
+    skipping = pages[0] != 0          # 첫 페이지가 1쪽이 아니면 첫 구분선까지는 앞 블록의 꼬리
+    for page, text in iter_page_texts(path, pages, workers, cache, drop):
+        if prev is not None and page != prev + 1:
+            buf, skipping = [], True  # 범위 빈틈: 걸쳐 있던 블록은 양쪽 모두 불완전
+        prev = page
+        for ln in text.split("\n") if text else ():
+            if ln == SEP:
+                if not skipping and (b := "\n".join(buf).strip()):
+                    yield b
+                buf, skipping = [], False
+            elif not skipping and not attach_year(buf, ln):   # 쪽이 바뀌며 떨어진 연도 태그도 처리
+                buf.append(ln)
+    if pages[-1] == n_pages - 1 and (b := "\n".join(buf).strip()):
+        yield b
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="PDF → '---' 블록 텍스트 추출 (페이지 병렬, 재개 가능)")
+    ap.add_argument("src", type=Path, help="입력 PDF")
+    ap.add_argument("-o", "--out", type=Path, help="출력 텍스트 (기본: 입력 이름.txt)")
+    ap.add_argument("--pages", help="페이지 범위 (1부터, 예: 1-120,200-)")
+    ap.add_argument("-j", "--workers", default=os.cpu_count() or 1, type=int, help="추출 프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--page-cache", type=Path, help="추출 페이지 캐시 (재개용 SQLite, 예: 책.pages.db)")
+    ap.add_argument("--drop", type=re.compile, help="제거할 라인 정규식 (머리말/쪽 번호 등)")
+    args = ap.parse_args(argv)
+
+    out = args.out or args.src.with_suffix(".txt")
+    t0 = time.perf_counter()
+    try:
+        pages = parse_pages(args.pages, page_count(args.src))
+    except ValueError as e:
+        ap.error(str(e))
+    cache = PageCache(args.page_cache, args.src, args.drop) if args.page_cache else None
+    n = 0
+    tmp = out.with_name(out.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for b in iter_pdf_blocks(args.src, pages, args.workers, cache, args.drop):
+                f.write(f"{SEP}\n" if n else "")
+                f.write(b + "\n")
+                n += 1
+        os.replace(tmp, out)
+    finally:
+        if cache:
+            cache.close()
+            print(cache.report())
+        tmp.unlink(missing_ok=True)
+    sec = time.perf_counter() - t0
+    print(f"{len(pages)}쪽 / {n:,}개 블록 → {out.as_posix()} ({sec:.2f}s, {len(pages) / sec:,.1f} pages/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+변환 파이프라인 계측 (--profile / --metrics)
+- 단계(section)별 호출 수와 '자기 자신' 시간(exclusive)을 기록
+  * 단계가 중첩되면(예: write 안에서 parse 제너레이터를 당김) 안쪽 단계 시간은 바깥 단계에서 빠짐
+  * timed_iter 로 제너레이터를 감싸면 next() 한 번이 호출 1회로 집계됨
+- 건너뛴 블록 수와 사유, 임의 카운터, 처리량(blocks/s), 최대 RSS 를 요약
+- 계측을 켜지 않으면 파이프라인에 아무것도 끼워 넣지 않으므로 비용 0
+"""
+import json, sys, time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+def peak_rss_kb():
+    """현재 프로세스 최대 RSS (KB). 측정 불가 플랫폼이면 None"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+class Metrics:
+    def __init__(self):
+        self.stages = {}          # name → [calls, exclusive_sec]
+        self.counters = Counter()
+        self.skips = Counter()
+        self.notes = {}
+        self._stack = []          # [name, start, child_sec]
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def section(self, name):
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            st = self.stages.setdefault(name, [0, 0.0])
+            st[0] += 1
+            st[1] += elapsed - frame[2]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def timed(self, name, fn):
+        def wrapper(*args, **kwargs):
+            with self.section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def timed_iter(self, name, iterable):
+        it = iter(iterable)
+        while True:
+            with self.section(name):
+                try:
+                    item = next(it)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def skip(self, reason):
+        self.skips[reason] += 1
+
+    def summary(self):
+        wall = time.perf_counter() - self._t0
+        blocks = self.counters.get("blocks", 0)
+        return {
+            "wall_sec": round(wall, 6),
+            "stages": {k: {"calls": c, "sec": round(s, 6)} for k, (c, s) in self.stages.items()},
+            "counters": dict(self.counters),
+            "blocks_per_sec": round(blocks / wall, 1) if wall and blocks else None,
+            "skipped": sum(self.skips.values()),
+            "skip_reasons": dict(self.skips),
+            "peak_rss_kb": peak_rss_kb(),
+            **self.notes,
+        }
+
+    def format(self, summary=None):
+        s = summary or self.summary()
+        lines = [f"계측: {s['wall_sec']:.3f}s, {s['blocks_per_sec'] or 0:,.0f} blocks/s, 최대 RSS {s['peak_rss_kb'] or 0:,} KB"]
+        for name, st in s["stages"].items():
+            lines.append(f"  {name:<10} {st['sec']:8.3f}s  {st['calls']:>9,} calls")
+        if s["counters"]:
+            lines.append("  " + "  ".join(f"{k} {v:,}" for k, v in s["counters"].items()))
+        if s["skipped"]:
+            lines.append(f"  건너뜀 {s['skipped']:,}: " + ", ".join(f"{k} {v}" for k, v in s["skip_reasons"].items()))
+        return "\n".join(lines)
+
+    def dump(self, path):
+        Path(path).write_text(json.dumps(self.summary(), ensure_ascii=False, indent=2), encoding="utf-8")
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+메모리 압축 코퍼스 저장소 (레코드 dict 리스트 대체)
+- 구조화 레코드를 열(column) 배열로 보관
+  * notebook_id / chapter_id : 값 표(intern) + 레코드별 u16 번호
+  * id / headword / phonetic / 뜻 / 예문 EN·KO : 문자열 풀 번호(u32). 같은 문자열은 한 번만 저장
+  * 연도 태그 ("YY", "모고"|"수능") : 태그 표 + 예문별 u16 번호 (0 = 없음)
+  * 뜻/예문 개수가 레코드마다 다르므로 레코드별 시작 위치 배열(u32)로 평탄화
+- 문자열 풀은 freeze 시 하나의 큰 str + 오프셋 배열로 합침 → 문자열 객체/딕셔너리 오버헤드 없음
+  (읽을 때마다 슬라이스로 새 str 을 만들므로 자주 쓰는 값은 호출 측에서 보관)
+  freeze 뒤에는 번호 색인이 없으므로 읽기 전용 — build() 이후 append 는 RuntimeError
+- RecordView: __slots__ 두 개짜리 지연 뷰. rec["headword"] / rec.get() / keys() 를 지원해
+  render_card / to_html_record 등 구조화 dict 를 받던 함수에 그대로 넘길 수 있음
+  as_dict() 는 원래 구조화 레코드와 같은 dict (JSON 직렬화용, 한 번에 하나씩만 만들어짐)
+- 하위 단계: write_records(store.iter_dicts() | store.iter_html_records(), ...),
+  export_db(store.iter_html_records(), ...) — 레코드를 하나씩 만들어 흘려보냄
+- 파이프라인 단계에는 끼우지 않음: pdf2json2/vocab_transform/export_sqlite 는 레코드를 하나씩 흘려보내 목록을 만들지 않고,
+  목록을 만드는 main.py(책 하나, 쓰기 직후 해제)와 vocab_server.load_build(Notebook blob 으로 인코딩 직후 해제)는
+  html·shared 레코드도 받아야 하는데 이 저장소는 구조화 레코드만 담음. 구조화 코퍼스를 오래 메모리에 둘 도구용
+- 사용: python record_store.py [입력.txt] — 현재 pdf2json2 레코드 리스트 대비 메모리 리포트 (tracemalloc)
+"""
+import argparse, sys, time, tracemalloc
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+
+from pdf2json2 import SRC, iter_structured, to_html_record
+
+NONE = 0xFFFFFFFF   # 문자열 풀 번호 자리의 None
+FIELDS = ("id", "notebook_id", "chapter_id", "headword", "phonetic", "meanings", "examples")
+
+class StringPool:
+    """문자열 → 번호. freeze() 후에는 하나의 str 과 오프셋 배열만 남음"""
+    def __init__(self):
+        self._index = {}
+        self._items = []
+        self.blob, self.offsets = "", array("I", [0])
+        self.frozen = False
+
+    def add(self, s):
+        if s is None:
+            return NONE
+        if self.frozen:
+            raise RuntimeError("freeze 된 문자열 풀에는 추가할 수 없음")
+        i = self._index.get(s)
+        if i is None:
+            i = self._index[s] = len(self._items)
+            self._items.append(s)
+        return i
+
+    def freeze(self):
+        self.blob = "".join(self._items)
+        pos = 0
+        for s in self._items:
+            pos += len(s)
+            self.offsets.append(pos)
+        self._index, self._items = {}, []
+        self.frozen = True
+
+    def __getitem__(self, i):
+        if i == NONE:
+            return None
+        return self.blob[self.offsets[i]:self.offsets[i + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+class RecordView(Mapping):
+    """저장소의 레코드 하나를 dict 처럼 읽는 지연 뷰"""
+    __slots__ = ("_s", "_i")
+
+    def __init__(self, store, i):
+        self._s, self._i = store, i
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self._s, "_" + key)(self._i)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def as_dict(self):
+        return {k: self[k] for k in FIELDS}
+
+    def __repr__(self):
+        return f"RecordView({self._i}, id={self['id']!r}, headword={self['headword']!r})"
+
+class RecordStore:
+    def __init__(self):
+        self.strings = StringPool()
+        self.notebooks, self.chapters, self.tags = [], [], [None]
+        self._nb_index, self._ch_index, self._tag_index = {}, {}, {None: 0}
+        self.rec_id, self.rec_hw, self.rec_phon = array("I"), array("I"), array("I")
+        self.rec_nb, self.rec_ch = array("H"), array("H")
+        self.mean_start, self.mean = array("I", [0]), array("I")
+        self.ex_start, self.ex_en, self.ex_ko, self.ex_tag = array("I", [0]), array("I"), array("I"), array("H")
+
+    @staticmethod
+    def _intern(table, index, value):
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(table)
+            table.append(value)
+        return i
+
+    @classmethod
+    def build(cls, records):
+        store = cls()
+        for rec in records:
+            store.append(rec)
+        store.strings.freeze()
+        return store
+
+    def append(self, rec):
+        if self.strings.frozen:   # 여기서 막지 않으면 일부 열만 늘어난 채로 실패
+            raise RuntimeError("build() 로 만든 RecordStore 는 읽기 전용")
+        add = self.strings.add
+        self.rec_id.append(add(rec["id"]))
+        self.rec_nb.append(self._intern(self.notebooks, self._nb_index, rec["notebook_id"]))
+        self.rec_ch.append(self._intern(self.chapters, self._ch_index, rec["chapter_id"]))
+        self.rec_hw.append(add(rec["headword"]))
+        self.rec_phon.append(add(rec["phonetic"]))
+        self.mean.extend(add(m) for m in rec["meanings"])
+        self.mean_start.append(len(self.mean))
+        for en, ko, year, exam in rec["examples"]:
+            self.ex_en.append(add(en))
+            self.ex_ko.append(add(ko))
+            self.ex_tag.append(self._intern(self.tags, self._tag_index, (year, exam) if year or exam else None))
+        self.ex_start.append(len(self.ex_en))
+
+    def __len__(self):
+        return len(self.rec_id)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return RecordView(self, i % len(self))
+
+    def __iter__(self):
+        return (RecordView(self, i) for i in range(len(self)))
+
+    # 필드 접근 (RecordView 가 사용)
+    def _id(self, i):
+        return self.strings[self.rec_id[i]]
+
+    def _notebook_id(self, i):
+        return self.notebooks[self.rec_nb[i]]
+
+    def _chapter_id(self, i):
+        return self.chapters[self.rec_ch[i]]
+
+    def _headword(self, i):
+        return self.strings[self.rec_hw[i]]
+
+    def _phonetic(self, i):
+        return self.strings[self.rec_phon[i]]
+
+    def _meanings(self, i):
+        s = self.strings
+        return [s[k] for k in self.mean[self.mean_start[i]:self.mean_start[i + 1]]]
+
+    def _examples(self, i):
+        s, tags = self.strings, self.tags
+        lo, hi = self.ex_start[i], self.ex_start[i + 1]
+        return [[s[en], s[ko], *(tags[t] or (None, None))]
+                for en, ko, t in zip(self.ex_en[lo:hi], self.ex_ko[lo:hi], self.ex_tag[lo:hi])]
+
+    def iter_dicts(self):
+        """구조화 레코드 dict 를 하나씩 (JSON/compact 출력용)"""
+        return (v.as_dict() for v in self)
+
+    def iter_html_records(self):
+        """기존 html 출력 레코드를 하나씩 (pretty JSON / export_db 용)"""
+        return map(to_html_record, self)
+
+    def nbytes(self):
+        """배열/풀이 차지하는 대략의 바이트 수"""
+        arrays = (self.strings.offsets, self.rec_id, self.rec_hw, self.rec_phon, self.rec_nb, self.rec_ch,
+                  self.mean_start, self.mean, self.ex_start, self.ex_en, self.ex_ko, self.ex_tag)
+        return sys.getsizeof(self.strings.blob) + sum(a.itemsize * len(a) for a in arrays)
+
+def _measure(build):
+    tracemalloc.start()
+    t = time.perf_counter()
+    obj = build()
+    sec = time.perf_counter() - t
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, peak, sec
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="압축 레코드 저장소 메모리 리포트 (dict 리스트 대비)")
+    ap.add_argument("src", nargs="?", default=SRC, type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    args = ap.parse_args(argv)
+
+    rows = []
+    html, cur, peak, sec = _measure(lambda: [to_html_record(r) for r in iter_structured(args.src)])
+    rows.append(("dict 리스트 (html, 현재 pdf2json2)", cur, peak, sec))
+    del html
+    structured, cur, peak, sec = _measure(lambda: list(iter_structured(args.src)))
+    rows.append(("dict 리스트 (구조화)", cur, peak, sec))
+    store, cur, peak, sec = _measure(lambda: RecordStore.build(iter_structured(args.src)))
+    rows.append(("RecordStore", cur, peak, sec))
+
+    ok = all(v.as_dict() == r for v, r in zip(store, structured)) and len(store) == len(structured)
+    base = rows[0][1]
+    print(f"레코드 {len(store):,} / 문자열 풀 {len(store.strings):,}개 / 챕터 {len(store.chapters)} / 태그 {len(store.tags) - 1}"
+          f" — 왕복 일치: {'예' if ok else '아니오'}")
+    for name, cur, peak, sec in rows:
+        print(f"  {name:<32} {cur / 1024:>10,.0f} KB (최대 {peak / 1024:>10,.0f} KB, {sec:.2f}s)  {cur / base:6.1%}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+표제어·뜻·예문 전문 검색 색인 (빌드 시 사전 계산)
+- 입력: 구조화 레코드 (원문 .txt 또는 compact 빌드, pdf2json2.iter_structured)
+- 색인어
+  * 영어: 소문자 단어 토큰 (표제어, 예문 EN, 뜻 안의 영어)
+  * 한글: 한글 연속 구간의 글자 2-gram (한 글자 구간은 1-gram) — 띄어쓰기/조사와 무관하게 부분 일치
+- 점수: 필드 가중 tf(표제어 4 / 뜻 2 / 예문 1) 의 BM25 포화 × idf 를 0~255 로 양자화한 impact
+- 포스팅: 색인어별로 impact 내림차순 정렬 → 질의 시 색인어마다 앞쪽 일부(BUDGET 을 색인어 수로 나눈 만큼)만
+  합산 (score-at-a-time). 흔한 색인어도 질의 시간이 코퍼스 크기에 비례하지 않으며,
+  df 가 배분량 이하인 색인어는 정확한 점수
+- 문서 = 레코드 하나. 여러 단어장을 합친 빌드에서는 id 가 겹치므로 문서마다 notebook_id 를 함께 보관
+  (단어장 표 + 문서별 u16 번호) → 검색 결과는 (notebook_id, id, headword, score)
+- 파일(.vidx): b"VIDX" + 버전 1바이트 + zlib( u32 메타 길이 + 메타 JSON + 문서번호 u32[] + impact u8[] )
+- 사용: python search_index.py build [입력] [-o vocab.vidx]
+        python search_index.py query vocab.vidx "접근하다" [-k 10]
+"""
+import argparse, json, math, re, struct, sys, time, zlib
+from array import array
+from collections import Counter, defaultdict
+from heapq import nlargest
+from pathlib import Path
+
+from pdf2json2 import SRC, iter_structured
+
+MAGIC, VERSION = b"VIDX", 2
+OUT_INDEX = Path("./vocab.vidx")
+FIELD_WEIGHTS = {"headword": 4.0, "meaning": 2.0, "example": 1.0}
+BM25_K1 = 1.2
+BUDGET = 2048        # 질의 한 번에 살펴볼 최대 포스팅 수 (색인어 수로 나눠 배분)
+
+EN_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+HANGUL_RUN = re.compile(r"[가-힣]+")
+
+def terms(text:str):
+    """텍스트 → 색인어 리스트 (영어 토큰 + 한글 2-gram)"""
+    out = EN_TOKEN.findall(text.lower())
+    for run in HANGUL_RUN.findall(text):
+        if len(run) == 1:
+            out.append(run)
+        else:
+            out.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return out
+
+def record_fields(rec):
+    """구조화 레코드 → (필드명, 텍스트) 스트림"""
+    yield "headword", rec["headword"]
+    for m in rec["meanings"]:
+        yield "meaning", m
+    for en, ko, _year, _exam in rec["examples"]:
+        yield "example", en
+        if ko:
+            yield "example", ko
+
+class SearchIndex:
+    def __init__(self, notebooks, doc_notebooks, ids, headwords, dictionary, docs, impacts, scale):
+        self.notebooks = notebooks      # 단어장 표 (notebook_id)
+        self.doc_notebooks = doc_notebooks   # array('H'), 문서번호 → 단어장 표 번호
+        self.ids = ids                  # 문서번호 → 레코드 id (단어장 안에서만 유일)
+        self.headwords = headwords
+        self.dictionary = dictionary    # 색인어 → (시작, 개수)
+        self.docs = docs                # array('I'), 색인어별 impact 내림차순
+        self.impacts = impacts          # array('B')
+        self.scale = scale              # impact 1 당 점수
+
+    @classmethod
+    def build(cls, records):
+        notebooks, nb_index, doc_notebooks = [], {}, array("H")
+        ids, headwords = [], []
+        postings = defaultdict(lambda: (array("I"), array("f")))   # 색인어 → (문서번호[], 가중 tf[])
+        for doc, rec in enumerate(records):
+            nb = nb_index.get(rec["notebook_id"])
+            if nb is None:
+                nb = nb_index[rec["notebook_id"]] = len(notebooks)
+                notebooks.append(rec["notebook_id"])
+            doc_notebooks.append(nb)
+            ids.append(rec["id"])
+            headwords.append(rec["headword"])
+            tf = Counter()
+            for field, text in record_fields(rec):
+                w = FIELD_WEIGHTS[field]
+                for t in terms(text):
+                    tf[t] += w
+            for t, wtf in tf.items():
+                pd, pw = postings[t]
+                pd.append(doc)
+                pw.append(wtf)
+        n = len(ids)
+        scored = {}
+        top = 0.0
+        for t, (pd, pw) in postings.items():
+            idf = math.log(1 + (n - len(pd) + 0.5) / (len(pd) + 0.5))
+            scored[t] = [(idf * wtf * (BM25_K1 + 1) / (wtf + BM25_K1), doc) for doc, wtf in zip(pd, pw)]
+            top = max(top, max(s for s, _ in scored[t]))
+        postings.clear()
+        scale = top / 255 if top else 1.0
+        dictionary, docs, impacts = {}, array("I"), array("B")
+        for t in sorted(scored):
+            plist = sorted(scored[t], key=lambda p: (-p[0], p[1]))
+            dictionary[t] = (len(docs), len(plist))
+            docs.extend(doc for _, doc in plist)
+            impacts.extend(max(1, round(s / scale)) for s, _ in plist)
+        return cls(notebooks, doc_notebooks, ids, headwords, dictionary, docs, impacts, scale)
+
+    def search(self, query:str, k=10, budget=BUDGET):
+        """질의 → [(notebook_id, id, headword, score)] 점수 내림차순. 모든 색인어를 포함한 문서가 먼저 옴"""
+        qterms = [t for t in dict.fromkeys(terms(query)) if t in self.dictionary]
+        acc, hits = defaultdict(int), defaultdict(int)
+        per_term = max(k * 8, budget // max(len(qterms), 1))
+        for t in qterms:
+            start, count = self.dictionary[t]
+            end = start + min(count, per_term)
+            for doc, imp in zip(self.docs[start:end], self.impacts[start:end]):
+                acc[doc] += imp
+                hits[doc] += 1
+        best = nlargest(k, acc, key=lambda d: (hits[d], acc[d], -d))
+        return [(self.notebooks[self.doc_notebooks[d]], self.ids[d], self.headwords[d], round(acc[d] * self.scale, 4))
+                for d in best]
+
+    def save(self, path):
+        meta = {
+            "notebooks": self.notebooks,
+            "doc_notebooks": self.doc_notebooks.tolist(),
+            "ids": self.ids,
+            "headwords": self.headwords,
+            "scale": self.scale,
+            "terms": [[t, start, count] for t, (start, count) in self.dictionary.items()],
+        }
+        meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        payload = struct.pack("<I", len(meta_bytes)) + meta_bytes + self.docs.tobytes() + self.impacts.tobytes()
+        Path(path).write_bytes(MAGIC + bytes([VERSION]) + zlib.compress(payload, 9))
+
+    @classmethod
+    def load(cls, path):
+        raw = Path(path).read_bytes()
+        if raw[:4] != MAGIC or raw[4] != VERSION:
+            raise ValueError(f"{path}: 검색 색인 파일이 아니거나 버전이 다름")
+        payload = zlib.decompress(raw[5:])
+        (meta_len,) = struct.unpack_from("<I", payload)
+        meta = json.loads(payload[4:4 + meta_len])
+        total = sum(count for _, _, count in meta["terms"])
+        docs = array("I")
+        docs.frombytes(payload[4 + meta_len:4 + meta_len + total * docs.itemsize])
+        impacts = array("B")
+        impacts.frombytes(payload[4 + meta_len + total * docs.itemsize:])
+        dictionary = {t: (start, count) for t, start, count in meta["terms"]}
+        return cls(meta["notebooks"], array("H", meta["doc_notebooks"]), meta["ids"], meta["headwords"],
+                   dictionary, docs, impacts, meta["scale"])
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="전문 검색 색인 빌드/질의")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="구조화 레코드 → .vidx")
+    b.add_argument("src", nargs="?", default=SRC, type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    b.add_argument("-o", "--out", default=OUT_INDEX, type=Path, help="색인 파일 (기본: %(default)s)")
+    b.add_argument("-j", "--workers", default=1, type=int, help="원문 파싱 프로세스 수")
+    q = sub.add_parser("query", help="색인 질의")
+    q.add_argument("index", type=Path)
+    q.add_argument("query")
+    q.add_argument("-k", default=10, type=int)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        t = time.perf_counter()
+        idx = SearchIndex.build(iter_structured(args.src, args.workers))
+        idx.save(args.out)
+        print(f"문서 {len(idx.ids):,} (단어장 {len(idx.notebooks)}) / 색인어 {len(idx.dictionary):,} / 포스팅 {len(idx.docs):,}"
+              f" → {args.out.as_posix()} ({args.out.stat().st_size:,} bytes, {time.perf_counter() - t:.2f}s)")
+        return 0
+
+    idx = SearchIndex.load(args.index)
+    t = time.perf_counter()
+    results = idx.search(args.query, args.k)
+    ms = (time.perf_counter() - t) * 1000
+    for rank, (nb, wid, hw, score) in enumerate(results, 1):
+        print(f"{rank:>3}. {nb} #{wid}  {hw:<24} {score:.3f}")
+    print(f"({len(results)}건, {ms:.3f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+간격 반복(SRS) 일괄 스케줄러 — db.ts 의 word_status(status, last_reviewed_at, next_due_at) 기준
+- 상태: NEW / LEARNING / MEMORIZED (클라이언트는 status != 'MEMORIZED' 를 미암기로 취급)
+  스키마에 간격 열이 없으므로 현재 간격 = next_due_at - last_reviewed_at 으로 복원
+- schedule(): (학습자 × 단어) 배열을 통째로 받아 NumPy 벡터 연산으로 다음 간격/상태/기한 계산
+  * 평가 AGAIN/HARD/GOOD/EASY (0~3)
+  * 학습 중(간격 0 포함): FIRST_IVL[평가] 일
+  * 복습: HARD ×hard, GOOD ×ease, EASY ×ease×easy_bonus (GOOD/EASY 는 최소 +1일), AGAIN → relearn 분 뒤 LEARNING
+  * max_ivl 로 상한, fuzz 비율만큼 난수 흔들기(2일 이상 간격만) → 같은 날 몰림 방지
+- DueQueue: 기한 힙. heapify O(n) 후 pop_due(N) 은 O(N log n). 갱신은 push 후 오래된 항목을 꺼낼 때 버림(lazy)
+- SQLite: load_status() 는 LEFT JOIN 한 번으로 전체 상태를 배열로, write_status() 는 임시 테이블 +
+  한 트랜잭션 executemany 로 일괄 교체 (word_id 당 한 행 유지)
+- 시간: int64 밀리초(epoch). DB 의 ISO 문자열(toISOString, ...Z) 과는 datetime64[ms] 로 일괄 변환
+- 사용: python srs_scheduler.py due vocab.db [-n 50] [--now 2025-03-01T09:00:00Z]
+        python srs_scheduler.py review vocab.db grades.json        ({"word_id": 평가, ...})
+        python srs_scheduler.py simulate [--learners 30] [--days 60] [--db vocab.db --out-dir class/]
+- numpy 필요 (pip install .[srs])
+"""
+import argparse, heapq, json, shutil, sqlite3, sys, time
+from pathlib import Path
+
+import numpy as np
+
+STATUSES = ("NEW", "LEARNING", "MEMORIZED")
+NEW, LEARNING, MEMORIZED = range(3)
+AGAIN, HARD, GOOD, EASY = range(4)
+GRADES = ("again", "hard", "good", "easy")
+
+DAY_MS = 86_400_000
+NAT = np.iinfo(np.int64).min           # datetime64 의 NaT 와 같은 값
+
+PARAMS = {
+    "first_ivl": (10 / 1440, 0.5, 1.0, 4.0),   # 학습 중 평가별 첫 간격(일)
+    "relearn": 10 / 1440,                      # 복습 실패 후 재학습 간격(일)
+    "hard": 1.2,
+    "ease": 2.5,
+    "easy_bonus": 1.3,
+    "max_ivl": 365.0,
+    "fuzz": 0.05,
+}
+
+# ---------- 벡터 스케줄 ----------
+def intervals(last, due):
+    """last/due(ms) → 현재 간격(일). 둘 중 하나라도 없으면 0"""
+    ok = (last != NAT) & (due != NAT)
+    return np.where(ok, (due - last) / DAY_MS, 0.0).clip(min=0.0)
+
+def schedule(status, last, due, grade, now, params=PARAMS, rng=None):
+    """모양이 같은 배열들 → (새 status, 새 last, 새 due). now 는 스칼라 또는 같은 모양 배열(ms)"""
+    status, grade = np.asarray(status), np.asarray(grade)
+    ivl = intervals(np.asarray(last), np.asarray(due))
+    learning = (status != MEMORIZED) | (ivl <= 0)
+    first = np.asarray(params["first_ivl"])[grade]
+    review = np.select(
+        [grade == HARD, grade == GOOD, grade == EASY],
+        [ivl * params["hard"],
+         np.maximum(ivl * params["ease"], ivl + 1),
+         np.maximum(ivl * params["ease"] * params["easy_bonus"], ivl + 1)],
+        default=params["relearn"],
+    )
+    new_ivl = np.where(learning, first, review).clip(max=params["max_ivl"])
+    if rng is not None and params["fuzz"]:
+        jitter = rng.uniform(1 - params["fuzz"], 1 + params["fuzz"], new_ivl.shape)
+        new_ivl = np.where(new_ivl >= 2, new_ivl * jitter, new_ivl)
+    new_status = np.where(grade == AGAIN, LEARNING, MEMORIZED).astype(np.int8)
+    new_last = np.broadcast_to(np.asarray(now, dtype=np.int64), new_ivl.shape).copy()
+    return new_status, new_last, new_last + np.rint(new_ivl * DAY_MS).astype(np.int64)
+
+# ---------- 기한 큐 ----------
+class DueQueue:
+    """(기한, 키) 최소 힙. 같은 키를 다시 push 하면 이전 항목은 꺼낼 때 무시"""
+    def __init__(self, keys=(), due=()):
+        self.due = {}
+        heap = []
+        for k, d in zip(keys, due):
+            if d != NAT:
+                self.due[k] = int(d)
+                heap.append((int(d), k))
+        heapq.heapify(heap)
+        self.heap = heap
+
+    def __len__(self):
+        return len(self.due)
+
+    def push(self, key, due):
+        self.due[key] = due
+        heapq.heappush(self.heap, (due, key))
+
+    def pop_due(self, n, now=None):
+        """기한이 now 이하(None 이면 제한 없음)인 항목을 기한 순으로 최대 n 개 꺼냄 → [(키, 기한)]"""
+        out = []
+        heap = self.heap
+        while heap and len(out) < n:
+            d, k = heap[0]
+            if now is not None and d > now:
+                break
+            heapq.heappop(heap)
+            if self.due.get(k) == d:
+                del self.due[k]
+                out.append((k, d))
+        return out
+
+# ---------- SQLite ----------
+def to_ms(values):
+    """ISO 문자열(또는 None) 시퀀스 → int64 ms 배열 (None → NAT)"""
+    arr = np.array([v[:-1] if v and v.endswith("Z") else (v or "NaT") for v in values], dtype="datetime64[ms]")
+    return arr.astype(np.int64)
+
+def to_iso(ms):
+    """int64 ms 배열 → toISOString 형식 문자열 리스트 (NAT → None)"""
+    s = np.datetime_as_string(np.asarray(ms, dtype=np.int64).astype("datetime64[ms]"), unit="ms")
+    return [None if v == "NaT" else v + "Z" for v in s.tolist()]
+
+def load_status(path):
+    """vocab.db → (word_id, status, last, due) 배열. word_status 가 없는 단어는 NEW.
+    같은 word_id 행이 여러 개면(INSERT OR REPLACE 가 id 로만 판정) 가장 최근 행을 사용"""
+    db = sqlite3.connect(path)
+    try:
+        rows = db.execute("""
+            SELECT w.id, ws.status, ws.last_reviewed_at, ws.next_due_at
+            FROM words w
+            LEFT JOIN (SELECT word_id, MAX(id) AS id FROM word_status GROUP BY word_id) latest ON latest.word_id = w.id
+            LEFT JOIN word_status ws ON ws.id = latest.id
+            ORDER BY w.id""").fetchall()
+    finally:
+        db.close()
+    code = {s: i for i, s in enumerate(STATUSES)}
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    status = np.array([code.get(r[1], NEW) for r in rows], dtype=np.int8)
+    return ids, status, to_ms(r[2] for r in rows), to_ms(r[3] for r in rows)
+
+def write_status(path, word_ids, status, last, due):
+    """주어진 단어들의 word_status 를 한 트랜잭션에서 일괄 교체"""
+    rows = list(zip(np.asarray(word_ids).tolist(), (STATUSES[s] for s in np.asarray(status).tolist()),
+                    to_iso(last), to_iso(due)))
+    db = sqlite3.connect(path, isolation_level=None)
+    try:
+        db.execute("BEGIN")
+        db.execute("CREATE TEMP TABLE batch(word_id INTEGER PRIMARY KEY, status TEXT, last_reviewed_at TEXT, next_due_at TEXT)")
+        db.executemany("INSERT INTO batch VALUES (?, ?, ?, ?)", rows)
+        db.execute("DELETE FROM word_status WHERE word_id IN (SELECT word_id FROM batch)")
+        db.execute("INSERT INTO word_status(word_id, status, last_reviewed_at, next_due_at) "
+                   "SELECT word_id, status, last_reviewed_at, next_due_at FROM batch")
+        db.execute("DROP TABLE batch")
+        db.execute("COMMIT")
+    finally:
+        db.close()
+    return len(rows)
+
+# ---------- 학급 시뮬레이션 ----------
+def simulate(learners, words, days, params=PARAMS, new_per_day=20, max_reviews=100, seed=0, start_ms=None):
+    """학습자 × 단어 가상 학급을 days 일 동안 돌림. 기억 모델: 회상 확률 exp(-경과일 / 안정도)
+    안정도는 학습자 능력 × 단어 난이도로 시작해 성공 시 늘고, 실패 시 절반(단 초기값 이상, 재학습 효과)으로 줄어듦.
+    반환: (일별 통계 리스트, status, last, due 배열 [learners, words])"""
+    rng = np.random.default_rng(seed)
+    start_ms = int(time.time() * 1000) // DAY_MS * DAY_MS if start_ms is None else start_ms
+    shape = (learners, words)
+    status = np.full(shape, NEW, dtype=np.int8)
+    last = np.full(shape, NAT, dtype=np.int64)
+    due = np.full(shape, NAT, dtype=np.int64)
+    initial = np.outer(rng.lognormal(0, 0.3, learners), rng.lognormal(0, 0.4, words)) * 3.0
+    stability = initial.copy()
+    queues = [DueQueue() for _ in range(learners)]
+    next_new = np.zeros(learners, dtype=np.int64)
+    log = []
+    for day in range(days):
+        now = start_ms + day * DAY_MS + 9 * 3_600_000
+        li, wi = [], []
+        for l, q in enumerate(queues):
+            picked = [w for w, _ in q.pop_due(max_reviews, now)]
+            fresh = range(next_new[l], min(next_new[l] + new_per_day, words))
+            next_new[l] = fresh.stop
+            picked.extend(fresh)
+            li.extend([l] * len(picked))
+            wi.extend(picked)
+        if not li:
+            log.append({"day": day, "reviews": 0, "new": 0, "recall": None})
+            continue
+        L, W = np.array(li), np.array(wi)
+        seen = status[L, W] != NEW
+        elapsed = np.where(seen, (now - last[L, W]) / DAY_MS, 0.0)
+        p = np.where(seen, np.exp(-elapsed / stability[L, W]), 0.0)
+        ok = rng.random(len(L)) < p
+        grade = np.where(~seen, GOOD, np.where(~ok, AGAIN, np.where(p > 0.9, EASY, np.where(p < 0.6, HARD, GOOD))))
+        s_new, l_new, d_new = schedule(status[L, W], last[L, W], due[L, W], grade, now, params, rng)
+        status[L, W], last[L, W], due[L, W] = s_new, l_new, d_new
+        growth = np.where(ok, 1 + 2.5 * (1 - p) + 0.5, 1.0)
+        stability[L, W] = np.where(seen & ~ok, np.maximum(stability[L, W] * 0.5, initial[L, W]), stability[L, W] * growth)
+        for l, w, d in zip(L.tolist(), W.tolist(), d_new.tolist()):
+            queues[l].push(w, d)
+        log.append({"day": day, "reviews": int(seen.sum()), "new": int((~seen).sum()),
+                    "recall": round(float(ok[seen].mean()), 4) if seen.any() else None})
+    return log, status, last, due
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SRS 일괄 스케줄러 (word_status)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    d = sub.add_parser("due", help="기한이 된 단어를 기한 순으로 N 개")
+    d.add_argument("db", type=Path)
+    d.add_argument("-n", default=50, type=int)
+    d.add_argument("--now", help="기준 시각 ISO (기본: 현재)")
+    r = sub.add_parser("review", help="평가 JSON({word_id: 0~3 또는 again/hard/good/easy}) 을 일괄 반영")
+    r.add_argument("db", type=Path)
+    r.add_argument("grades", type=Path)
+    r.add_argument("--now", help="복습 시각 ISO (기본: 현재)")
+    s = sub.add_parser("simulate", help="가상 학급으로 스케줄 파라미터 점검")
+    s.add_argument("--learners", default=30, type=int)
+    s.add_argument("--words", default=2000, type=int, help="--db 가 있으면 DB 의 단어 수")
+    s.add_argument("--days", default=60, type=int)
+    s.add_argument("--new-per-day", default=20, type=int)
+    s.add_argument("--max-reviews", default=100, type=int, help="하루 최대 복습 수")
+    s.add_argument("--seed", default=0, type=int)
+    s.add_argument("--db", type=Path, help="단어 id 를 가져올 기준 vocab.db")
+    s.add_argument("--out-dir", type=Path, help="학습자별 vocab.db 사본에 결과 word_status 저장 (--db 필요)")
+    for p in (r, s):
+        p.add_argument("--ease", default=PARAMS["ease"], type=float)
+        p.add_argument("--max-ivl", default=PARAMS["max_ivl"], type=float)
+        p.add_argument("--fuzz", default=PARAMS["fuzz"], type=float)
+    args = ap.parse_args(argv)
+
+    now = int(to_ms([args.now])[0]) if getattr(args, "now", None) else int(time.time() * 1000)
+    if args.cmd == "due":
+        ids, _status, _last, due = load_status(args.db)
+        q = DueQueue(ids.tolist(), due.tolist())
+        picked = q.pop_due(args.n, now)
+        for wid, when in picked:
+            print(f"{wid:>8}  {to_iso([when])[0]}")
+        print(f"({len(picked)}건 / 예약 {len(q) + len(picked):,}건)")
+        return 0
+
+    params = {**PARAMS, "ease": args.ease, "max_ivl": args.max_ivl, "fuzz": args.fuzz}
+    if args.cmd == "review":
+        ids, status, last, due = load_status(args.db)
+        try:
+            raw = json.loads(args.grades.read_text(encoding="utf-8"))
+        except ValueError as e:
+            ap.error(f"{args.grades}: JSON 이 아님 ({e})")
+        if not isinstance(raw, dict):
+            ap.error(f"{args.grades}: {{word_id: 평가}} 객체여야 함 ({type(raw).__name__})")
+        pos = {w: i for i, w in enumerate(ids.tolist())}
+        rows = {w: pos.get(int(w)) if str(w).strip().isdigit() else None for w in raw}
+        unknown = [w for w, i in rows.items() if i is None]
+        if unknown:
+            ap.error(f"{args.db} 에 없는 word_id: {', '.join(map(str, unknown[:10]))}" + (" …" if len(unknown) > 10 else ""))
+        seen = {}
+        for w, i in rows.items():
+            if i in seen:
+                ap.error(f"같은 단어를 가리키는 word_id 중복: {seen[i]!r} / {w!r}")
+            seen[i] = w
+        # bool 은 int 의 하위형이라 True in range(4) 가 참 → 정수는 type 으로 확인
+        bad = {w: g for w, g in raw.items()
+               if not (g in GRADES if isinstance(g, str) else type(g) is int and 0 <= g < len(GRADES))}
+        if bad:
+            ap.error("잘못된 평가 (0~3 또는 " + "/".join(GRADES) + "): "
+                     + ", ".join(f"{w}={g!r}" for w, g in list(bad.items())[:10]))
+        sel = np.array(list(rows.values()), dtype=np.int64)
+        grade = np.array([GRADES.index(g) if isinstance(g, str) else int(g) for g in raw.values()], dtype=np.int64)
+        s_new, l_new, d_new = schedule(status[sel], last[sel], due[sel], grade, now, params, np.random.default_rng())
+        n = write_status(args.db, ids[sel], s_new, l_new, d_new)
+        print(f"{n}개 단어 갱신 → {args.db.as_posix()}")
+        return 0
+
+    word_ids = load_status(args.db)[0] if args.db else np.arange(1, args.words + 1)
+    t = time.perf_counter()
+    log, status, last, due = simulate(args.learners, len(word_ids), args.days, params,
+                                      args.new_per_day, args.max_reviews, args.seed, now // DAY_MS * DAY_MS)
+    sec = time.perf_counter() - t
+    reviews = sum(x["reviews"] for x in log)
+    recalls = [x["recall"] for x in log if x["recall"] is not None]
+    seen = int((status != NEW).sum())
+    print(f"학습자 {args.learners} × 단어 {len(word_ids):,} × {args.days}일: 복습 {reviews:,}회"
+          f" (학습자·일당 {reviews / args.learners / args.days:.1f}), 평균 회상률 {np.mean(recalls) if recalls else 0:.3f},"
+          f" 학습 단어 {seen:,} 중 MEMORIZED {(status == MEMORIZED).sum() / max(seen, 1):.1%} ({sec:.2f}s)")
+    for x in log[::max(1, args.days // 10)]:
+        print(f"  day {x['day']:>3}: 복습 {x['reviews']:>5,} / 신규 {x['new']:>4,} / 회상률 {x['recall'] if x['recall'] is not None else '-'}")
+    if args.out_dir:
+        if not args.db:
+            ap.error("--out-dir 는 --db 와 함께 사용")
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+        for l in range(args.learners):
+            dst = args.out_dir / f"learner_{l + 1:03d}.db"
+            shutil.copyfile(args.db, dst)
+            seen_w = status[l] != NEW
+            write_status(dst, word_ids[seen_w], status[l][seen_w], last[l][seen_w], due[l][seen_w])
+        print(f"학습자별 DB {args.learners}개 → {args.out_dir.as_posix()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from concordance import Concordance, Lemmatizer
+
+LEXICON = ("the", "thing", "things", "ear", "early", "earring", "let", "letter", "letting", "for", "forest",
+           "car", "card", "care", "caring", "new", "news", "newly", "run", "running", "stop", "stopped",
+           "use", "used", "study", "studies", "big", "bigger", "open", "opening")
+
+def record(rid, *sentences, headword="word"):
+    return {"id": rid, "notebook_id": "nb", "chapter_id": "01", "headword": headword, "phonetic": None,
+            "meanings": [], "examples": [[en, None, None, None] for en in sentences]}
+
+def test_suffix_stripping_does_not_merge_unrelated_words():
+    lemma = Lemmatizer(headwords=(), lexicon=LEXICON)
+    for word in ("thing", "early", "earring", "letter", "forest", "card", "news", "newly"):
+        assert lemma(word) == word, word
+    assert lemma("things") == "thing"
+    assert lemma("caring") == "care"
+
+def test_regular_inflections_still_merge():
+    lemma = Lemmatizer(headwords=(), lexicon=LEXICON)
+    assert lemma("running") == "run"
+    assert lemma("stopped") == "stop"
+    assert lemma("studies") == "study"
+    assert lemma("opening") == "open"
+    assert lemma("letting") == "let"
+
+def test_derivational_suffix_needs_headword():
+    assert Lemmatizer(headwords=(), lexicon=LEXICON)("bigger") == "bigger"
+    assert Lemmatizer(headwords=("big",), lexicon=LEXICON)("bigger") == "big"
+
+def test_occurrences_of_thing_are_not_under_the():
+    idx = Concordance.build([record("0001", "The thing is that things change.")])
+    assert [off for _, _, off in idx.occurrences("thing")] == [4, 18]
+    assert len(idx.occurrences("the")) == 1
+
+def test_long_sentence_offsets_are_not_clamped(tmp_path):
+    en = "x " * 40000 + "encyclopedia" + "s" * 300
+    idx = Concordance.build([record("0001", en)])
+    idx.save(tmp_path / "t.vkwic")
+    loaded = Concordance.load(tmp_path / "t.vkwic")
+    token = "encyclopedia" + "s" * 300
+    [(_, _, left, kw, _)] = loaded.kwic(token, width=4)
+    assert kw == token and left == "x x "
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from search_index import SearchIndex
+
+def record(nb, rid, headword, meaning, example):
+    return {"id": rid, "notebook_id": nb, "chapter_id": "01", "headword": headword, "phonetic": None,
+            "meanings": [meaning], "examples": [[example, None, None, None]]}
+
+BOOKS = [
+    record("단어장 A", "0001", "approach", "접근하다", "They approach the city."),
+    record("단어장 A", "0002", "access", "접근", "Access is limited."),
+    record("단어장 B", "0001", "abandon", "버리다", "Never abandon hope."),
+    record("단어장 B", "0002", "approach", "다가가다", "Winter approaches."),
+]
+
+def test_results_carry_notebook_id_for_overlapping_ids():
+    idx = SearchIndex.build(BOOKS)
+    assert idx.search("abandon", k=1)[0][:3] == ("단어장 B", "0001", "abandon")
+    assert {(nb, rid) for nb, rid, hw, _ in idx.search("approach") if hw == "approach"} == {
+        ("단어장 A", "0001"), ("단어장 B", "0002")}
+
+def test_notebook_ids_survive_save_and_load(tmp_path):
+    idx = SearchIndex.build(BOOKS)
+    idx.save(tmp_path / "t.vidx")
+    loaded = SearchIndex.load(tmp_path / "t.vidx")
+    assert loaded.notebooks == ["단어장 A", "단어장 B"]
+    for query in ("approach", "접근", "hope"):
+        assert loaded.search(query) == idx.search(query)
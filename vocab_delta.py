@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+두 빌드(JSON 배열 / NDJSON) 사이의 델타 패치 생성·적용
+- diff : id 기준으로 비교해 추가/삭제/변경(바뀐 필드만) 을 담은 작은 패치 생성
+- apply: 기준 빌드에 패치를 적용하고 결과 해시를 패치의 target_sha256 과 대조
+- 해시: 레코드 순서대로 compact JSON + '\\n' 을 이은 바이트의 sha256 (출력 레이아웃과 무관)
+- 패치 형식 (vocab-delta/1)
+  {"format", "key": "id", "base_sha256", "target_sha256", "count",
+   "added":   [{"index": 대상 빌드 내 위치, "record": {...}}, ...],
+   "removed": [id, ...],
+   "changed": {str(id): {필드: 새 값, ...}},     (객체 키라 정수 id 도 문자열로)
+   "unset":   {str(id): [없어진 필드, ...]},          (있을 때만)
+   "replaced":{str(id): 전체 레코드},             (필드 순서가 바뀌어 부분 갱신으로 재현 안 될 때만)
+   "order":   [id, ...]}                         (기본 적용 순서로 대상 순서가 안 나올 때만)
+- 사용: python vocab_delta.py diff  OLD.json NEW.json [-o patch.json]
+        python vocab_delta.py apply BASE.json patch.json [-o OUT.json] [--json pretty|compact|ndjson]
+"""
+import argparse, hashlib, json, sys
+from pathlib import Path
+
+from json_output import LAYOUTS, iter_build, record_encoder, write_records
+
+PATCH_FORMAT = "vocab-delta/1"
+KEY = "id"
+
+def load_build(path):
+    """빌드 → 레코드 리스트. 레이아웃은 확장자가 아니라 내용으로 판별 (main.py 는 NDJSON 도 .json 으로 씀)"""
+    return list(iter_build(path))
+
+def build_hash(records)->str:
+    encode = record_encoder("ndjson")
+    h = hashlib.sha256()
+    for rec in records:
+        h.update(encode(rec))
+        h.update(b"\n")
+    return h.hexdigest()
+
+def _index(records):
+    by_key, names = {}, set()
+    for rec in records:
+        k = rec[KEY]
+        if k in by_key or str(k) in names:   # 1 과 "1" 도 패치의 객체 키로는 같으므로 중복
+            raise ValueError(f"중복 {KEY}: {k}")
+        by_key[k] = rec
+        names.add(str(k))
+    return by_key
+
+def _apply_order(base, patch):
+    """삭제 → 변경 → 추가(index 위치에 삽입) 순으로 적용한 레코드 리스트"""
+    removed = set(patch["removed"])
+    changed, unset, replaced = patch["changed"], patch.get("unset", {}), patch.get("replaced", {})
+    out = []
+    for rec in base:
+        if rec[KEY] in removed:
+            continue
+        k = str(rec[KEY])   # changed/unset/replaced 는 JSON 객체라 키가 문자열 (정수 id 도 "12")
+        if k in replaced:
+            rec = replaced[k]
+        elif k in changed or k in unset:
+            rec = {f: v for f, v in rec.items() if f not in unset.get(k, ())}
+            rec.update(changed.get(k, {}))
+        out.append(rec)
+    for a in patch["added"]:
+        out.insert(a["index"], a["record"])
+    return out
+
+def diff_builds(old, new):
+    """두 레코드 리스트 → 패치 dict"""
+    old_by = _index(old)
+    new_by = _index(new)
+    patch = {
+        "format": PATCH_FORMAT,
+        "key": KEY,
+        "base_sha256": build_hash(old),
+        "target_sha256": build_hash(new),
+        "count": len(new),
+        "added": [{"index": i, "record": rec} for i, rec in enumerate(new) if rec[KEY] not in old_by],
+        "removed": [rec[KEY] for rec in old if rec[KEY] not in new_by],
+        "changed": {},
+    }
+    unset, replaced = {}, {}
+    for rec in new:
+        prev = old_by.get(rec[KEY])
+        if prev is None or (prev == rec and list(prev) == list(rec)):
+            continue
+        fields = {f: v for f, v in rec.items() if prev.get(f, object()) != v}
+        gone = [f for f in prev if f not in rec]
+        merged = {f: v for f, v in prev.items() if f not in gone}
+        merged.update(fields)
+        if list(merged) != list(rec):
+            replaced[str(rec[KEY])] = rec
+            continue
+        if fields:
+            patch["changed"][str(rec[KEY])] = fields
+        if gone:
+            unset[str(rec[KEY])] = gone
+    if unset:
+        patch["unset"] = unset
+    if replaced:
+        patch["replaced"] = replaced
+    # 추가 위치만으로 레코드 순서가 재현되지 않으면(순서 변경) 전체 id 순서를 함께 담음
+    if build_hash(_apply_order(old, patch)) != patch["target_sha256"]:
+        patch["order"] = [rec[KEY] for rec in new]
+    return patch
+
+def apply_patch(base, patch, verify=True):
+    """기준 레코드 리스트에 패치 적용. verify 면 base/target 해시 불일치 시 ValueError"""
+    if patch.get("format") != PATCH_FORMAT:
+        raise ValueError(f"지원하지 않는 패치 형식: {patch.get('format')}")
+    if verify and build_hash(base) != patch["base_sha256"]:
+        raise ValueError("기준 빌드 해시가 패치의 base_sha256 과 다름")
+    out = _apply_order(base, patch)
+    if "order" in patch:
+        by = _index(out)
+        out = [by[k] for k in patch["order"]]
+    if verify and build_hash(out) != patch["target_sha256"]:
+        raise ValueError("적용 결과 해시가 패치의 target_sha256 과 다름")
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="빌드 간 델타 패치 생성/적용")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    d = sub.add_parser("diff", help="OLD → NEW 패치 생성")
+    d.add_argument("old", type=Path)
+    d.add_argument("new", type=Path)
+    d.add_argument("-o", "--out", default=Path("./vocab.patch.json"), type=Path, help="패치 파일 (기본: %(default)s)")
+    a = sub.add_parser("apply", help="BASE 에 패치를 적용하고 해시 검증")
+    a.add_argument("base", type=Path)
+    a.add_argument("patch", type=Path)
+    a.add_argument("-o", "--out", type=Path, help="결과 빌드 (생략 시 검증만)")
+    a.add_argument("--json", choices=LAYOUTS, default="pretty", help="결과 레이아웃 (기본: %(default)s)")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "diff":
+        new = load_build(args.new)
+        patch = diff_builds(load_build(args.old), new)
+        args.out.write_text(json.dumps(patch, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        size = args.out.stat().st_size
+        print(f"추가 {len(patch['added'])} / 삭제 {len(patch['removed'])} / 변경 {len(patch['changed'])}"
+              f" → {args.out.as_posix()} ({size:,} bytes, 대상 빌드 {args.new.stat().st_size:,} bytes)")
+        return 0
+
+    patch = json.loads(args.patch.read_text(encoding="utf-8"))
+    try:
+        out = apply_patch(load_build(args.base), patch)
+    except ValueError as e:
+        print(f"적용 실패: {e}", file=sys.stderr)
+        return 1
+    if args.out:
+        write_records(out, args.out, args.json)
+    print(f"적용 완료: {len(out)}개 레코드, sha256 {patch['target_sha256'][:16]}… 일치" + (f" → {args.out.as_posix()}" if args.out else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
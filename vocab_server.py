@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 단어장 HTTP 서버 (asyncio, 표준 라이브러리만 사용)
+- 빌드를 한 번 읽어 메모리에 올림: pdf2json2 출력(.json/.ndjson, html·compact·shared) 또는 main.py 출력 디렉터리(index.json)
+  * shared 빌드는 예문 표(index.json 의 "examples" / example_table.find_table)로 예문을 펼쳐 compact 와 같은 모양으로 서빙
+  * notebook 별로 레코드를 compact JSON 바이트로 미리 인코딩해 하나의 blob + 오프셋 배열로 보관
+  * id → 레코드 번호, chapter_id → 레코드 번호 배열을 미리 계산 → 페이지 응답은 blob 슬라이스를 이어 붙이기만 함
+  * 표제어 검색은 headword_index.HeadwordIndex (자동완성 + 오타 허용)
+- 엔드포인트 (GET/HEAD, JSON)
+  * /notebooks                                   : 단어장 목록과 챕터별 단어 수
+  * /notebooks/{nb}/words?chapter=&offset=&limit= : 단어 페이지 {"total","offset","limit","items"} (limit 기본 50, 최대 500)
+  * /notebooks/{nb}/words/{id}                    : 단어 하나
+  * /notebooks/{nb}/search?q=&limit=             : 표제어 검색 {"query","items":[{"headword","ids","distance"}]}
+  (경로의 notebook_id 는 URL 인코딩)
+- 캐시: 응답마다 ETag (빌드 해시 + 정규화한 요청). If-None-Match 가 맞으면 304
+  Cache-Control: no-cache → 클라이언트는 매번 재검증하고, 바뀌지 않은 페이지는 본문 없이 받음
+- gzip: Accept-Encoding 에 gzip 이 있고 본문이 GZIP_MIN 바이트 이상이면 압축본 (Vary: Accept-Encoding, ETag 는 "-gz" 로 구분)
+- 만든 응답(본문/압축본/ETag)은 LRU 로 CACHE_SIZE 개까지 보관 → 반복 요청은 헤더만 조립
+- HTTP/1.1 keep-alive, 요청 본문 없는 GET/HEAD 전용 (그 외 메서드 405)
+- 사용: python main.py serve [빌드.json | 출력 디렉터리] [--host 0.0.0.0] [--port 8765]
+        python vocab_server.py ...   (같은 인자)
+"""
+import argparse, asyncio, gzip, hashlib, json, sys, time
+from array import array
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from example_table import ExampleTable, expand_records, find_table
+from headword_index import HeadwordIndex
+from json_output import iter_build, record_encoder, resolve_backend
+from pdf2json2 import OUT_JSON
+
+HOST, PORT = "127.0.0.1", 8765
+PAGE_LIMIT, MAX_LIMIT = 50, 500
+SEARCH_LIMIT = 10
+GZIP_MIN = 1024
+CACHE_SIZE = 4096
+MAX_HEADER = 16 * 1024
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           431: "Request Header Fields Too Large"}
+
+def load_build(path):
+    """빌드 파일/디렉터리 → notebook_id → 레코드 리스트 (입력 순서)"""
+    path = Path(path)
+    if path.is_dir():
+        index = json.loads((path / "index.json").read_text(encoding="utf-8"))
+        files = [path / nb["file"] for nb in index["notebooks"]]   # 레이아웃은 iter_build 가 내용으로 판별
+        table_path = path / index["examples"]["file"] if "examples" in index else None
+    else:
+        files = [path]
+        table_path = find_table(path)
+    table = ExampleTable.load(table_path) if table_path else None
+    books = {}
+    for f in files:
+        for rec in expand_records(iter_build(f), table, f):
+            books.setdefault(rec["notebook_id"], []).append(rec)
+    return books
+
+class Notebook:
+    """단어장 하나: 미리 인코딩한 레코드 blob + id/챕터 오프셋 + 표제어 색인"""
+    __slots__ = ("notebook_id", "blob", "offsets", "by_id", "chapters", "index")
+
+    def __init__(self, notebook_id, records, encode):
+        self.notebook_id = notebook_id
+        parts, self.offsets = [], array("Q", [0])
+        self.by_id, chapters = {}, {}
+        for i, rec in enumerate(records):
+            data = encode(rec) + b","
+            parts.append(data)
+            self.offsets.append(self.offsets[-1] + len(data))
+            self.by_id.setdefault(rec["id"], i)
+            chapters.setdefault(rec["chapter_id"], array("I")).append(i)
+        self.blob = b"".join(parts)   # 레코드마다 뒤에 ',' → 연속 구간은 슬라이스 하나가 곧 배열 본문
+        self.chapters = dict(sorted(chapters.items()))
+        self.index = HeadwordIndex.build(records)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def record(self, i)->bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def items(self, rows)->bytes:
+        """레코드 번호들 → JSON 배열 바이트 (연속 구간이면 blob 슬라이스 하나)"""
+        if not rows:
+            return b"[]"
+        first, last = rows[0], rows[-1]
+        if last - first == len(rows) - 1:
+            return b"[" + self.blob[self.offsets[first]:self.offsets[last + 1] - 1] + b"]"
+        return b"[" + b",".join(map(self.record, rows)) + b"]"
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class VocabApp:
+    """요청 대상(경로+쿼리) → (상태, 본문, gzip 본문|None, ETag). 결과는 LRU 캐시"""
+    def __init__(self, books, backend="auto", gzip_min=GZIP_MIN, cache_size=CACHE_SIZE):
+        encode = record_encoder("compact", resolve_backend(backend))
+        self.dumps = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.notebooks = {nb: Notebook(nb, recs, encode) for nb, recs in books.items()}
+        h = hashlib.blake2b(digest_size=8)
+        for book in self.notebooks.values():
+            h.update(book.notebook_id.encode("utf-8") + b"\0")
+            h.update(book.blob)
+        self.build_tag = h.hexdigest()
+        self.gzip_min = gzip_min
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def response(self, target:str):
+        url = urlsplit(target)
+        key = url.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(parse_qsl(url.query)))
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        try:
+            status, body = 200, self.route(url.path, dict(parse_qsl(url.query)))
+        except HttpError as e:
+            status, body = e.status, self.dumps({"error": str(e)})
+        etag = f'"{self.build_tag}-{hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()}'
+        packed = gzip.compress(body, 6, mtime=0) if len(body) >= self.gzip_min else None
+        entry = (status, body, packed, etag)
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def route(self, path:str, query:dict)->bytes:
+        parts = [unquote(p) for p in path.split("/") if p]   # 세그먼트별 디코딩 ('%2F' 가 든 id 도 그대로)
+        if parts in ([], ["notebooks"]):
+            return self.dumps({"notebooks": [
+                {"notebook_id": b.notebook_id, "count": len(b),
+                 "chapters": [{"chapter_id": ch, "count": len(rows)} for ch, rows in b.chapters.items()]}
+                for b in self.notebooks.values()]})
+        if len(parts) < 3 or parts[0] != "notebooks":
+            raise HttpError(404, f"없는 경로: {path}")
+        book = self.notebooks.get(parts[1])
+        if book is None:
+            raise HttpError(404, f"없는 notebook_id: {parts[1]}")
+        if parts[2:] == ["words"]:
+            return self.words(book, query)
+        if parts[2] == "words" and len(parts) == 4:
+            i = book.by_id.get(parts[3])
+            if i is None:
+                raise HttpError(404, f"없는 id: {parts[3]}")
+            return book.record(i)
+        if parts[2:] == ["search"]:
+            return self.search(book, query)
+        raise HttpError(404, f"없는 경로: {path}")
+
+    @staticmethod
+    def _int(query, name, default, lo, hi):
+        try:
+            value = int(query.get(name, default))
+        except ValueError:
+            raise HttpError(400, f"{name} 은 정수여야 함") from None
+        if not lo <= value <= hi:
+            raise HttpError(400, f"{name} 범위는 {lo}..{hi}")
+        return value
+
+    def words(self, book, query)->bytes:
+        offset = self._int(query, "offset", 0, 0, 1 << 31)
+        limit = self._int(query, "limit", PAGE_LIMIT, 1, MAX_LIMIT)
+        chapter = query.get("chapter")
+        if chapter is None:
+            total = len(book)
+            rows = range(offset, min(offset + limit, total))
+        else:
+            if chapter not in book.chapters:
+                raise HttpError(404, f"없는 chapter_id: {chapter}")
+            ch = book.chapters[chapter]
+            total, rows = len(ch), ch[offset:offset + limit]
+        head = self.dumps({"notebook_id": book.notebook_id, "chapter_id": chapter,
+                           "total": total, "offset": offset, "limit": limit})
+        return head[:-1] + b',"items":' + book.items(rows) + b"}"
+
+    def search(self, book, query)->bytes:
+        q = query.get("q", "").strip()
+        if not q:
+            raise HttpError(400, "q 가 필요함")
+        limit = self._int(query, "limit", SEARCH_LIMIT, 1, MAX_LIMIT)
+        hits = book.index.lookup(q, limit)
+        return self.dumps({"query": q, "items": [{"headword": hw, "ids": ids, "distance": dist} for hw, ids, dist in hits]})
+
+def http_date(_cache=[0, ""]):
+    now = int(time.time())
+    if now != _cache[0]:
+        _cache[0], _cache[1] = now, formatdate(now, usegmt=True)
+    return _cache[1]
+
+def etag_matches(header:str, etag:str)->bool:
+    if header.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+def accepts_gzip(header:str)->bool:
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "x-gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+def build_response(app, method, target, headers, keep_alive)->bytes:
+    if method not in ("GET", "HEAD"):
+        status, body, packed, etag = 405, app.dumps({"error": f"{method} 지원 안 함"}), None, None
+    else:
+        status, body, packed, etag = app.response(target)
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Date: {http_date()}",
+             "Content-Type: application/json; charset=utf-8", "Access-Control-Allow-Origin: *"]
+    if status == 200:
+        gz = packed is not None and accepts_gzip(headers.get("accept-encoding", ""))
+        if gz:
+            body, etag = packed, etag + '-gz"'
+        else:
+            etag += '"'
+        lines += [f"ETag: {etag}", "Cache-Control: no-cache", "Vary: Accept-Encoding"]
+        if etag_matches(headers.get("if-none-match", "#"), etag):
+            status, body = 304, b""
+            lines[0] = "HTTP/1.1 304 Not Modified"
+        elif gz:
+            lines.append("Content-Encoding: gzip")
+    if status == 405:
+        lines.append("Allow: GET, HEAD")
+    if status != 304:
+        lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head if method == "HEAD" or status == 304 else head + body
+
+async def handle(app, reader, writer):
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                writer.write(b"HTTP/1.1 431 Request Header Fields Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            request, *fields = raw.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = request.split(" ", 2)
+            except ValueError:
+                writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                break
+            headers = {}
+            for field in fields:
+                name, sep, value = field.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            conn = headers.get("connection", "").lower()
+            keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+            if "content-length" in headers or "transfer-encoding" in headers:
+                keep_alive = False   # 요청 본문은 받지 않음 → 연결을 끊어 다음 요청과 섞이지 않게
+            writer.write(build_response(app, method, target, headers, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(app, host=HOST, port=PORT, ready=None):
+    server = await asyncio.start_server(lambda r, w: handle(app, r, w), host, port, limit=MAX_HEADER)
+    if ready:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="단어장 빌드를 페이지 단위 JSON 으로 제공하는 로컬 HTTP 서버")
+    ap.add_argument("src", nargs="?", default=OUT_JSON, type=Path, help="빌드 JSON/NDJSON 또는 main.py 출력 디렉터리 (기본: %(default)s)")
+    ap.add_argument("--host", default=HOST, help="바인드 주소 (기본: %(default)s, LAN 공개는 0.0.0.0)")
+    ap.add_argument("--port", default=PORT, type=int, help="포트 (기본: %(default)s)")
+    ap.add_argument("--gzip-min", default=GZIP_MIN, type=int, help="이 바이트 이상인 본문만 gzip (기본: %(default)s)")
+    ap.add_argument("--serializer", default="auto", choices=("auto", "json", "orjson"), help="레코드 인코딩 백엔드")
+    args = ap.parse_args(argv)
+    if not args.src.exists():
+        ap.error(f"빌드 없음: {args.src}")
+
+    t0 = time.perf_counter()
+    app = VocabApp(load_build(args.src), args.serializer, args.gzip_min)
+    total = sum(len(b) for b in app.notebooks.values())
+    size = sum(len(b.blob) for b in app.notebooks.values())
+    print(f"{len(app.notebooks)}권 / {total:,}개 항목 ({size / 1024:,.0f} KB) 적재 ({time.perf_counter() - t0:.2f}s), build {app.build_tag}")
+    def ready(server):
+        for sock in server.sockets:
+            host, port = sock.getsockname()[:2]
+            print(f"http://{host}:{port}/notebooks")
+    try:
+        asyncio.run(serve(app, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
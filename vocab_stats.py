@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+출제 연도/시험 집계표 (빌드 시 사전 계산, Stats 화면용)
+- 입력: 구조화 레코드의 examples[i] = [en, ko, "YY"|null, "모고"|"수능"|null]
+  (원문 .txt / compact 빌드, 또는 pdf2json2 --stats 로 변환과 같은 패스에서 집계)
+- 출력: 열 지향(columnar) JSON — 표마다 {열 이름: [값, ...]} 라서 클라이언트는 HTML 파싱 없이 바로 차트에 사용
+  {"format": "vocab-stats/1",
+   "totals":        {"words", "examples", "tagged", "모고", "수능"},
+   "by_year":       {"year": [2001, ...], "모고": [...], "수능": [...], "total": [...]},       (연도 오름차순)
+   "by_exam":       {"exam": ["모고", "수능"], "examples": [...], "words": [...]},
+   "by_chapter":    {"notebook_id", "chapter_id", "words", "examples", "tagged", "모고", "수능"},
+   "top_headwords": {"id", "headword", "chapter_id", "tested", "모고", "수능", "first_year", "last_year"}}
+   top_headwords 는 출제 예문 수 → 수능 수 → id 순 상위 N 개
+- 두 자리 연도는 90 이상이면 19YY, 아니면 20YY (수능 첫 시행 1993 이후 범위)
+- 사용: python vocab_stats.py [입력] [-o vocab_stats.json] [--top 100]
+"""
+import argparse, json, sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from line_classifier import YEAR_EXAMS
+
+STATS_FORMAT = "vocab-stats/1"
+OUT_STATS = Path("./vocab_stats.json")
+TOP_N = 100
+
+def full_year(yy:str)->int:
+    n = int(yy)
+    return 1900 + n if n >= 90 else 2000 + n
+
+class StatsBuilder:
+    """구조화 레코드를 하나씩 받아 집계. tee() 로 변환 파이프라인 중간에 끼울 수 있음"""
+    def __init__(self, top=TOP_N):
+        self.top = top
+        self.words = 0
+        self.examples = 0
+        self.by_year = defaultdict(Counter)          # 연도 → {시험: 예문 수}
+        self.exam_examples = Counter()
+        self.exam_words = Counter()
+        self.chapters = {}                           # (notebook_id, chapter_id) → Counter
+        self.tested = []                             # (id, headword, chapter_id, Counter(시험), 연도들)
+
+    def add(self, rec):
+        self.words += 1
+        ch = self.chapters.setdefault((rec["notebook_id"], rec["chapter_id"]), Counter())
+        ch["words"] += 1
+        exams, years = Counter(), []
+        for _en, _ko, yy, exam in rec["examples"]:
+            self.examples += 1
+            ch["examples"] += 1
+            if not exam:
+                continue
+            year = full_year(yy)
+            self.by_year[year][exam] += 1
+            self.exam_examples[exam] += 1
+            ch["tagged"] += 1
+            ch[exam] += 1
+            exams[exam] += 1
+            years.append(year)
+        for exam in exams:
+            self.exam_words[exam] += 1
+        if exams:
+            self.tested.append((rec["id"], rec["headword"], rec["chapter_id"], exams, years))
+
+    def tee(self, records):
+        for rec in records:
+            self.add(rec)
+            yield rec
+
+    def tables(self):
+        years = sorted(self.by_year)
+        chapters = sorted(self.chapters)
+        top = sorted(self.tested, key=lambda t: (-sum(t[3].values()), -t[3]["수능"], t[0]))[:self.top]
+        return {
+            "format": STATS_FORMAT,
+            "totals": {
+                "words": self.words,
+                "examples": self.examples,
+                "tagged": sum(self.exam_examples.values()),
+                **{exam: self.exam_examples[exam] for exam in YEAR_EXAMS},
+            },
+            "by_year": {
+                "year": years,
+                **{exam: [self.by_year[y][exam] for y in years] for exam in YEAR_EXAMS},
+                "total": [sum(self.by_year[y].values()) for y in years],
+            },
+            "by_exam": {
+                "exam": list(YEAR_EXAMS),
+                "examples": [self.exam_examples[exam] for exam in YEAR_EXAMS],
+                "words": [self.exam_words[exam] for exam in YEAR_EXAMS],
+            },
+            "by_chapter": {
+                "notebook_id": [nb for nb, _ in chapters],
+                "chapter_id": [ch for _, ch in chapters],
+                **{col: [self.chapters[k][col] for k in chapters]
+                   for col in ("words", "examples", "tagged", *YEAR_EXAMS)},
+            },
+            "top_headwords": {
+                "id": [t[0] for t in top],
+                "headword": [t[1] for t in top],
+                "chapter_id": [t[2] for t in top],
+                "tested": [sum(t[3].values()) for t in top],
+                **{exam: [t[3][exam] for t in top] for exam in YEAR_EXAMS},
+                "first_year": [min(t[4]) for t in top],
+                "last_year": [max(t[4]) for t in top],
+            },
+        }
+
+    def write(self, path):
+        Path(path).write_text(json.dumps(self.tables(), ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+def main(argv=None):
+    from pdf2json2 import SRC, iter_structured   # pdf2json2 가 이 모듈을 import 하므로 CLI 에서만
+    ap = argparse.ArgumentParser(description="출제 연도/시험 집계표 생성")
+    ap.add_argument("src", nargs="?", default=SRC, type=Path, help="원문 .txt 또는 compact 빌드 (기본: %(default)s)")
+    ap.add_argument("-o", "--out", default=OUT_STATS, type=Path, help="집계 JSON (기본: %(default)s)")
+    ap.add_argument("-j", "--workers", default=1, type=int, help="원문 파싱 프로세스 수")
+    ap.add_argument("--top", default=TOP_N, type=int, help="최다 출제 표제어 수 (기본: %(default)s)")
+    args = ap.parse_args(argv)
+
+    stats = StatsBuilder(args.top)
+    for rec in iter_structured(args.src, args.workers):
+        stats.add(rec)
+    stats.write(args.out)
+    t = stats.tables()["totals"]
+    print(f"단어 {t['words']:,} / 예문 {t['examples']:,} / 출제 표시 {t['tagged']:,}"
+          f" (모고 {t['모고']:,}, 수능 {t['수능']:,}) → {args.out.as_posix()} ({args.out.stat().st_size:,} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+기존 빌드(JSON 배열 / NDJSON)의 필드 일괄 변환 — id_chage.py 같은 일회성 수정 스크립트 대체
+- 스트리밍: json_output.iter_build 로 레코드를 하나씩 읽어 변환 즉시 JsonWriter 로 기록
+  → 메모리는 레코드 하나 + 읽기 청크 수준 (수 GB 병합 코퍼스도 그대로 처리). 출력은 임시 파일 후 교체
+- 연산 (선언형 옵션, 아래 순서로 적용)
+  * --notebook OLD=NEW : notebook_id 바꾸기 (여러 번 지정 가능). '=' 없이 NEW 만 주면 전부 NEW 로
+  * --renumber [START] : notebook_id 별로 입력 순서대로 id 를 START(기본 1)부터 다시 매김
+  * --chapter-size N   : chapter_id = (id - 1) // N + 1   (id_chage.py 의 floor((id-1)/40)+1 → --chapter-size 40)
+  * --id-width W / --chapter-width W : 0 채움 자릿수 ("0001" → 4, "01" → 2). 0 이면 정수로 저장
+    지정하지 않으면 원래 표현(문자열이면 그 자릿수, 정수면 정수)을 유지
+- id 가 바뀐 html 레코드는 카드의 '#id' 표시(pdf2json2.CARD_TMPL 의 meta)도 함께 고침
+- shared 빌드는 예문 표(<이름>.examples.json 또는 main.py 의 examples.json)를 출력 옆 <출력 이름>.examples.json 으로 복사
+  (예문 참조는 그대로)
+- 사용: python vocab_transform.py 빌드.json -o 새빌드.json --chapter-size 40
+        python vocab_transform.py merged.ndjson -o out.ndjson --notebook "합성 단어장 1=단어장 A" --renumber
+        python vocab_transform.py 빌드.json -o 빌드.json --id-width 0 --chapter-width 0 --json compact
+"""
+import argparse, shutil, sys, time
+from pathlib import Path
+
+from example_table import examples_path, find_table
+from json_output import LAYOUTS, JsonWriter, iter_build, sniff_layout
+
+META_TMPL = "<div class='meta'>#{}</div>"   # pdf2json2.CARD_TMPL 과 같게 유지할 것
+
+def number(value, field:str)->int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} 가 숫자가 아님: {value!r}") from None
+
+def formatted(n:int, like, width):
+    """n 을 width 자리 0 채움 문자열로 (0 이면 정수). width 가 None 이면 like 와 같은 표현"""
+    if width is None:
+        width = len(like) if isinstance(like, str) else 0
+    return f"{n:0{width}d}" if width else n
+
+class Transform:
+    def __init__(self, notebooks=None, default_notebook=None, renumber=None, chapter_size=None,
+                 id_width=None, chapter_width=None):
+        if chapter_size is not None and chapter_size < 1:
+            raise ValueError("chapter_size 는 1 이상")
+        self.notebooks = dict(notebooks or {})
+        self.default_notebook = default_notebook
+        self.renumber = renumber
+        self.chapter_size = chapter_size
+        self.id_width = id_width
+        self.chapter_width = chapter_width
+        self._next = {}                     # notebook_id → 다음 id (renumber)
+        self.count = self.changed = 0
+
+    def __call__(self, rec):
+        out = dict(rec)
+        nb = out.get("notebook_id")
+        nb = self.default_notebook if self.default_notebook is not None else self.notebooks.get(nb, nb)
+        out["notebook_id"] = nb
+        if self.renumber is not None:
+            n = self._next.get(nb, self.renumber)
+            self._next[nb] = n + 1
+        else:
+            n = number(rec["id"], "id")
+        if self.renumber is not None or self.id_width is not None:
+            out["id"] = formatted(n, rec["id"], self.id_width)
+        if self.chapter_size is not None:
+            out["chapter_id"] = formatted((n - 1) // self.chapter_size + 1, rec.get("chapter_id"), self.chapter_width)
+        elif self.chapter_width is not None:
+            out["chapter_id"] = formatted(number(rec["chapter_id"], "chapter_id"), rec["chapter_id"], self.chapter_width)
+        if "html_content" in out and str(out["id"]) != str(rec["id"]):
+            out["html_content"] = out["html_content"].replace(
+                META_TMPL.format(rec["id"]), META_TMPL.format(out["id"]), 1)
+        self.count += 1
+        self.changed += out != rec
+        return out
+
+    def apply(self, records):
+        return map(self, records)
+
+    def report(self)->str:
+        return f"레코드 {self.count:,} / 변경 {self.changed:,}"
+
+def parse_notebook_ops(specs):
+    """['OLD=NEW', 'NEW'] → ({OLD: NEW}, 전체를 바꿀 NEW | None)"""
+    mapping, default = {}, None
+    for spec in specs or ():
+        old, eq, new = spec.partition("=")
+        if eq:
+            mapping[old] = new
+        else:
+            default = spec
+    if mapping and default is not None:
+        raise ValueError("--notebook 에 OLD=NEW 와 전체 바꾸기(NEW)를 함께 쓸 수 없음")
+    return mapping, default
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="빌드 JSON/NDJSON 필드 일괄 변환 (스트리밍)")
+    ap.add_argument("src", type=Path, help="입력 빌드 (JSON 배열 또는 NDJSON)")
+    ap.add_argument("-o", "--out", required=True, type=Path, help="출력 빌드 (입력과 같아도 됨 — 끝난 뒤 교체)")
+    ap.add_argument("--notebook", action="append", metavar="OLD=NEW", help="notebook_id 바꾸기 (NEW 만 주면 전부)")
+    ap.add_argument("--renumber", nargs="?", const=1, type=int, metavar="START", help="notebook 별로 id 다시 매기기")
+    ap.add_argument("--chapter-size", type=int, metavar="N", help="chapter_id = (id - 1) // N + 1")
+    ap.add_argument("--id-width", type=int, metavar="W", help="id 0 채움 자릿수 (0: 정수)")
+    ap.add_argument("--chapter-width", type=int, metavar="W", help="chapter_id 0 채움 자릿수 (0: 정수)")
+    ap.add_argument("--json", choices=LAYOUTS, help="출력 레이아웃 (기본: 입력과 같게)")
+    ap.add_argument("--serializer", default="auto", choices=("auto", "json", "orjson"))
+    args = ap.parse_args(argv)
+
+    try:
+        mapping, default = parse_notebook_ops(args.notebook)
+        transform = Transform(mapping, default, args.renumber, args.chapter_size, args.id_width, args.chapter_width)
+    except ValueError as e:
+        ap.error(str(e))
+    layout = args.json or sniff_layout(args.src)
+    t0 = time.perf_counter()
+    try:
+        with JsonWriter(args.out, layout, args.serializer) as w:
+            for rec in transform.apply(iter_build(args.src)):
+                w.write(rec)
+    except ValueError as e:
+        print(f"{args.src}: {transform.count + 1}번째 레코드: {e}", file=sys.stderr)
+        return 1
+    sidecar = find_table(args.src)
+    if sidecar and examples_path(args.out).resolve() != sidecar.resolve():
+        shutil.copyfile(sidecar, examples_path(args.out))
+        print(f"예문 표 → {examples_path(args.out).as_posix()}")
+    sec = time.perf_counter() - t0
+    print(f"{transform.report()} → {args.out.as_posix()} ({layout}, {sec:.2f}s, {transform.count / max(sec, 1e-9):,.0f} rec/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())